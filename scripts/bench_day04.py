@@ -0,0 +1,51 @@
+"""
+Benchmark for day 4's bingo `Tournament`.
+
+Plays random tournaments of increasing numbers of boards and board sizes
+and prints the throughput (boards per second) for each.
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent.resolve()
+sys.path.insert(0, str(ROOT))
+
+from src.day04.day04 import Tournament  # noqa: E402
+
+BOARD_COUNTS = [10_000, 100_000, 1_000_000]
+BOARD_SIZES = [(5, 5), (10, 10), (20, 20)]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the day 4 tournament.")
+    parser.add_argument(
+        "--workers", type=int, default=None, help="Worker processes (default: CPUs)."
+    )
+    parser.add_argument(
+        "--shard-size", type=int, default=65_536, help="Boards per shard."
+    )
+    parser.add_argument(
+        "--max-cells",
+        type=int,
+        default=100_000_000,
+        help="Skip any tournament with more cells than this, to keep memory in check.",
+    )
+    args: argparse.Namespace = parser.parse_args()
+
+    print(f"{'boards':>10} {'size':>7} {'seconds':>9} {'boards/s':>12}")
+    for rows, cols in BOARD_SIZES:
+        for boards in BOARD_COUNTS:
+            if boards * rows * cols > args.max_cells:
+                continue
+
+            tournament = Tournament.random(boards, rows, cols, seed=2021)
+
+            start = time.perf_counter()
+            tournament.play(workers=args.workers, shard_size=args.shard_size)
+            elapsed = time.perf_counter() - start
+
+            print(
+                f"{boards:>10,} {f'{rows}x{cols}':>7} {elapsed:>9.3f} {boards / elapsed:>12,.0f}"
+            )
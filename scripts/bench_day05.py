@@ -0,0 +1,66 @@
+"""
+Benchmark for day 5's parallel line rasterization.
+
+Generates a synthetic set of vent lines (horizontal, vertical and 45 degree)
+and times `parallel_overlaps` on it with an increasing number of workers.
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).parent.parent.resolve()
+sys.path.insert(0, str(ROOT))
+
+from src.day05.day05 import parallel_overlaps  # noqa: E402
+
+# Every direction a line can go in, as (dx, dy) steps
+DIRECTIONS = np.array([(1, 0), (0, 1), (1, 1), (1, -1)])
+
+
+def random_lines(
+    lines: int, size: int, max_length: int, seed: int | None = None
+) -> np.ndarray:
+    """
+    Returns the (x1, y1, x2, y2) of `lines` random lines starting
+    inside a `size` x `size` area.
+    """
+    rng = np.random.default_rng(seed)
+    starts = rng.integers(0, size, size=(lines, 2))
+    steps = DIRECTIONS[rng.integers(0, len(DIRECTIONS), size=lines)]
+    lengths = rng.integers(0, max_length, size=(lines, 1))
+    return np.hstack([starts, starts + steps * lengths]).astype(np.int64)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the day 5 parallel count.")
+    parser.add_argument("--lines", type=int, default=1_000_000, help="Number of lines.")
+    parser.add_argument("--size", type=int, default=10_000, help="Width of the area.")
+    parser.add_argument(
+        "--max-length", type=int, default=100, help="Longest line to generate."
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        nargs="+",
+        default=[1, 2, 4, 8],
+        help="Worker counts to try.",
+    )
+    args: argparse.Namespace = parser.parse_args()
+
+    ends = random_lines(args.lines, args.size, args.max_length, seed=2021)
+
+    baseline = None
+    print(f"{'workers':>7} {'seconds':>9} {'speedup':>8} {'overlaps':>12}")
+    for workers in args.workers:
+        start = time.perf_counter()
+        overlaps = parallel_overlaps(ends, workers=workers)
+        elapsed = time.perf_counter() - start
+
+        baseline = baseline or elapsed
+        print(
+            f"{workers:>7} {elapsed:>9.3f} {baseline / elapsed:>8.2f} {overlaps:>12,}"
+        )
@@ -88,20 +88,85 @@ In this example, there are 5 sums that are larger than the previous sum.
 Consider sums of a three-measurement sliding window. How many sums are larger than the previous sum?
 """
 
+from __future__ import annotations
+
+import collections
+import concurrent.futures
+import functools
+import itertools
+import os
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Any, Iterable, Iterator
 
+import numpy as np
+import numpy.typing as npt
 
-def number_of_increases(readings: list[int]) -> int:
+# Either a plain list from the puzzle input or a contiguous numpy array
+# (which includes the memory mapped ones from `load_binary`)
+Readings = list[int] | npt.NDArray[np.integer[Any]]
+
+# Packed binary readings are little-endian 32 bit signed ints
+BINARY_DTYPE = np.dtype("<i4")
+READING_LIMITS = np.iinfo(np.int32)
+
+# Converting a list to a numpy array isn't free, so below this many readings
+# the plain python versions are just as quick
+NUMPY_THRESHOLD = 10_000
+
+
+def _use_numpy(readings: Readings) -> bool:
+    """
+    Decides whether `readings` should be handed off to the numpy backend.
+    """
+    return isinstance(readings, np.ndarray) or len(readings) >= NUMPY_THRESHOLD
+
+
+def _as_array(readings: Readings) -> npt.NDArray[np.integer[Any]]:
+    """
+    Returns `readings` as a contiguous integer array, integer arrays
+    (including memory maps) are passed through without copying.
+    """
+    if isinstance(readings, np.ndarray) and np.issubdtype(readings.dtype, np.integer):
+        return readings
+    return np.ascontiguousarray(readings, dtype=np.int64)
+
+
+def _numpy_number_of_increases(readings: npt.NDArray[np.integer[Any]]) -> int:
+    """
+    Vectorised version of `number_of_increases`.
+    """
+    # Comparing rather than subtracting means narrow dtypes can't overflow
+    return int(np.count_nonzero(readings[1:] > readings[:-1]))
+
+
+def _numpy_number_of_grouped_increases(
+    readings: npt.NDArray[np.integer[Any]], group_size: int
+) -> int:
+    """
+    Vectorised version of `number_of_grouped_increases`.
+    """
+    # See `number_of_grouped_increases` for why this compares readings not sums
+    return int(np.count_nonzero(readings[group_size:] > readings[:-group_size]))
+
+
+def number_of_increases(readings: Readings) -> int:
     """
     Returns the number of times a reading in `readings` has increased
     relative to the previous value.
 
+    Large inputs (or ones that are already numpy arrays) are handed off
+    to a vectorised numpy implementation.
+
     Args:
-        readings (list[int]): The list of readings.
+        readings (Readings): The list of readings.
 
     Returns:
         int: Number of increases.
     """
+    if _use_numpy(readings):
+        return _numpy_number_of_increases(_as_array(readings))
+
     # Subtract each element from the one before it
     diff = [readings[i] - readings[i - 1] for i in range(1, len(readings))]
 
@@ -110,44 +175,559 @@ def number_of_increases(readings: list[int]) -> int:
     return len(positives)
 
 
-def number_of_grouped_increases(readings: list[int], group_size: int = 3) -> int:
+def number_of_grouped_increases(readings: Readings, group_size: int = 3) -> int:
     """
     Returns the number of times the sum consecutive group of size `group_size`
     has increased relative to the sum of a previous group.
 
+    Large inputs (or ones that are already numpy arrays) are handed off
+    to a vectorised numpy implementation.
+
     Args:
-        readings (list[int]): The list of readings.
+        readings (Readings): The list of readings.
         group_size (int, optional): Size of the rolling window group.
             Defaults to 3.
 
     Returns:
         int: Number of increases.
     """
-    # Sum up each consecutive group of `group_size` and add to a list
-    grouped_sums: list[int] = []
-    for i in range(len(readings)):
-        group = readings[i : i + group_size]
-        if len(group) == 3:
-            # If we have a fully populated group
-            grouped_sums.append(sum(group))
+    if group_size < 1:
+        raise ValueError(f"group_size must be at least 1, got {group_size}")
 
-    # Now can just feed the sum list into `number_of_increases`
-    return number_of_increases(grouped_sums)
+    if _use_numpy(readings):
+        return _numpy_number_of_grouped_increases(_as_array(readings), group_size)
+
+    # Consecutive windows share all but one reading, so the next sum is bigger
+    # exactly when the reading entering the window is bigger than the one
+    # leaving it. No need to work out (or store) any of the sums!
+    return sum(
+        readings[i] > readings[i - group_size] for i in range(group_size, len(readings))
+    )
+
+
+def grouped_increases_sweep(
+    readings: Readings | Iterable[int | str],
+    group_sizes: Iterable[int],
+    block_size: int = 65_536,
+) -> dict[int, int]:
+    """
+    Returns the number of grouped increases for every size in `group_sizes`
+    in one pass over `readings`.
+
+    Arrays (and lists big enough for the numpy backend) are walked a block at
+    a time with every group size compared while the block is still in cache.
+    Anything else, e.g. an open file, is streamed through a ring buffer
+    holding only the largest group's worth of readings.
+
+    Args:
+        readings (Readings | Iterable[int | str]): The readings, or lines of
+            text containing one reading each.
+        group_sizes (Iterable[int]): Sizes of the rolling window groups.
+        block_size (int, optional): Number of readings per block for the numpy
+            walk. Defaults to 65_536.
+
+    Returns:
+        dict[int, int]: Number of grouped increases keyed by group size.
+    """
+    sizes = list(dict.fromkeys(group_sizes))
+    if any(size < 1 for size in sizes):
+        raise ValueError(f"group sizes must be at least 1, got {sizes}")
+
+    counts = {size: 0 for size in sizes}
+    if not sizes:
+        return counts
+
+    if isinstance(readings, (list, np.ndarray)) and _use_numpy(readings):
+        array = _as_array(readings)
+        for start in range(0, len(array), block_size):
+            stop = min(start + block_size, len(array))
+            for size in sizes:
+                low = max(start, size)
+                if low < stop:
+                    entering = array[low:stop]
+                    leaving = array[low - size : stop - size]
+                    counts[size] += int(np.count_nonzero(entering > leaving))
+        return counts
+
+    # Ring buffer of the last `capacity` readings, `seen` is how many we've had
+    capacity = max(sizes)
+    ring = [0] * capacity
+    seen = 0
+    for reading in _parse_readings(readings):
+        for size in sizes:
+            if seen >= size and reading > ring[(seen - size) % capacity]:
+                counts[size] += 1
+        ring[seen % capacity] = reading
+        seen += 1
+
+    return counts
+
+
+def _parse_readings(readings: Iterable[int | str]) -> Iterator[int]:
+    """
+    Lazily converts `readings` to ints, skipping any blank lines
+    e.g. a trailing newline at the end of a file.
+    """
+    for item in readings:
+        if isinstance(item, str) and not item.strip():
+            continue
+        yield int(item)
+
+
+def stream_increases(
+    readings: Iterable[int | str], group_size: int = 3
+) -> tuple[int, int]:
+    """
+    Counts both the raw and the grouped increases in a single pass over
+    `readings`, only ever holding the last `group_size` readings in memory.
+
+    `readings` can be any iterable of ints or strings, so an open file
+    can be passed straight in and it will be read line by line.
+
+    Because consecutive windows share all but one reading, the sum of
+    the next window is bigger than the current one exactly when the reading
+    entering the window is bigger than the one leaving it, so we never
+    need to actually compute any sums.
+
+    Args:
+        readings (Iterable[int | str]): The readings, or lines of text
+            containing one reading each.
+        group_size (int, optional): Size of the rolling window group.
+            Defaults to 3.
+
+    Returns:
+        tuple[int, int]: Number of increases and number of grouped increases.
+    """
+    if group_size < 1:
+        raise ValueError(f"group_size must be at least 1, got {group_size}")
+
+    window: collections.deque[int] = collections.deque(maxlen=group_size)
+    increases = 0
+    grouped_increases = 0
+
+    for reading in _parse_readings(readings):
+        if window:
+            if reading > window[-1]:
+                increases += 1
+            # window[0] is the reading about to drop out of the group
+            if len(window) == group_size and reading > window[0]:
+                grouped_increases += 1
+
+        window.append(reading)
+
+    return increases, grouped_increases
+
+
+@dataclass
+class SonarMonitor:
+    """
+    Keeps the raw and grouped increase counts up to date as readings
+    arrive one at a time, in O(1) per reading.
+
+    Only the last `group_size` readings are kept, in a fixed size ring
+    buffer, and the whole state can be saved with `snapshot` and picked
+    back up later with `restore`.
+
+    Args:
+        group_size (int, optional): Size of the rolling window group.
+            Defaults to 3.
+    """
+
+    group_size: int = 3
+    increases: int = 0
+    grouped_increases: int = 0
+    readings_seen: int = 0
+    ring: list[int] = field(default_factory=list)
+
+    def __post_init__(self) -> None:
+        if self.group_size < 1:
+            raise ValueError(f"group_size must be at least 1, got {self.group_size}")
+
+        if not self.ring:
+            self.ring = [0] * self.group_size
+
+        if len(self.ring) != self.group_size:
+            raise ValueError(
+                f"ring has {len(self.ring)} slots, expected {self.group_size}"
+            )
+
+    def append(self, reading: int) -> None:
+        """
+        Adds a new reading, updating the counts.
+        """
+        # The slot we're about to overwrite holds the reading that's
+        # just left the window
+        slot = self.readings_seen % self.group_size
+
+        if self.readings_seen:
+            if reading > self.ring[slot - 1]:
+                self.increases += 1
+            if self.readings_seen >= self.group_size and reading > self.ring[slot]:
+                self.grouped_increases += 1
+
+        self.ring[slot] = reading
+        self.readings_seen += 1
+
+    def extend(self, readings: Iterable[int | str]) -> None:
+        """
+        Adds every reading in `readings`, which can be lines from a file.
+        """
+        for reading in _parse_readings(readings):
+            self.append(reading)
+
+    def snapshot(self) -> dict[str, Any]:
+        """
+        Returns the monitor's state as a plain (JSON serialisable) dict.
+        """
+        return {
+            "group_size": self.group_size,
+            "increases": self.increases,
+            "grouped_increases": self.grouped_increases,
+            "readings_seen": self.readings_seen,
+            "ring": list(self.ring),
+        }
+
+    @classmethod
+    def restore(cls, snapshot: dict[str, Any]) -> SonarMonitor:
+        """
+        Rebuild a `SonarMonitor` from a `snapshot`.
+        """
+        return SonarMonitor(**{**snapshot, "ring": list(snapshot["ring"])})
+
+
+@dataclass
+class IncreaseIndex:
+    """
+    Prefix counts of the raw and grouped increases in a report so the
+    number of increases in any range of it can be answered in O(1).
+
+    `raw[k]` and `grouped[k]` are the number of increases ending before
+    reading `k`, so both have one more entry than there are readings.
+
+    Build one with `IncreaseIndex.build`.
+    """
+
+    raw: npt.NDArray[np.unsignedinteger[Any]]
+    grouped: npt.NDArray[np.unsignedinteger[Any]]
+    group_size: int = 3
+
+    def __len__(self) -> int:
+        """
+        Number of readings covered by the index.
+        """
+        return len(self.raw) - 1
+
+    @classmethod
+    def build(cls, readings: Readings, group_size: int = 3) -> IncreaseIndex:
+        """
+        Build the index in one O(n) pass over `readings`.
+        """
+        if group_size < 1:
+            raise ValueError(f"group_size must be at least 1, got {group_size}")
+
+        array = _as_array(readings)
+        n = len(array)
+
+        # Smallest dtype that can hold a count of every reading
+        dtype: type[np.unsignedinteger[Any]] = np.uint32 if n < 2**32 else np.uint64
+
+        raw = np.zeros(n + 1, dtype=dtype)
+        np.cumsum(array[1:] > array[:-1], out=raw[2:])
+
+        grouped = np.zeros(n + 1, dtype=dtype)
+        if n > group_size:
+            np.cumsum(
+                array[group_size:] > array[:-group_size], out=grouped[group_size + 1 :]
+            )
+
+        return IncreaseIndex(raw=raw, grouped=grouped, group_size=group_size)
+
+    def increases(self, start: int = 0, stop: int | None = None) -> int:
+        """
+        Returns the number of increases in `readings[start:stop]`,
+        the same as `number_of_increases(readings[start:stop])`.
+        """
+        start, stop, _ = slice(start, stop).indices(len(self))
+        if start + 1 >= stop:
+            return 0
+        return int(self.raw[stop] - self.raw[start + 1])
+
+    def grouped_increases(self, start: int = 0, stop: int | None = None) -> int:
+        """
+        Returns the number of grouped increases in `readings[start:stop]`, the same
+        as `number_of_grouped_increases(readings[start:stop], self.group_size)`.
+        """
+        start, stop, _ = slice(start, stop).indices(len(self))
+        if start + self.group_size >= stop:
+            return 0
+        return int(self.grouped[stop] - self.grouped[start + self.group_size])
+
+    def save(self, path: str | os.PathLike[str]) -> None:
+        """
+        Save the index to `path` (an uncompressed numpy .npz file).
+        """
+        # Pass a file object so numpy doesn't tack on an extra .npz suffix
+        with open(path, "wb") as f:
+            np.savez(f, raw=self.raw, grouped=self.grouped, group_size=self.group_size)
+
+    @classmethod
+    def load(cls, path: str | os.PathLike[str]) -> IncreaseIndex:
+        """
+        Load an index previously written by `save`.
+        """
+        with np.load(path) as data:
+            return IncreaseIndex(
+                raw=data["raw"],
+                grouped=data["grouped"],
+                group_size=int(data["group_size"]),
+            )
+
+
+def to_binary(
+    readings: Iterable[int | str],
+    path: str | os.PathLike[str],
+    chunk_size: int = 65_536,
+) -> int:
+    """
+    Writes `readings` to `path` as packed little-endian 32 bit ints
+    so they can later be memory mapped with `load_binary` rather than
+    parsed from text every time.
+
+    `readings` is consumed `chunk_size` at a time so an open text file
+    of any size can be converted without loading it all, any reading
+    that won't fit in 32 bits raises a ValueError.
+
+    Args:
+        readings (Iterable[int | str]): The readings, or lines of text
+            containing one reading each.
+        path (str | os.PathLike[str]): Where to write the binary file.
+        chunk_size (int, optional): Number of readings to convert at a time.
+            Defaults to 65_536.
+
+    Returns:
+        int: Number of readings written.
+    """
+    parsed = _parse_readings(readings)
+    written = 0
+
+    with open(path, "wb") as f:
+        while chunk := list(itertools.islice(parsed, chunk_size)):
+            # Older numpy silently wraps anything too big when converting
+            # straight to 32 bits, so go via 64 and check the range first
+            values = np.array(chunk, dtype=np.int64)
+            if not (
+                READING_LIMITS.min <= values.min()
+                and values.max() <= READING_LIMITS.max
+            ):
+                raise ValueError("reading too big for the binary format")
+
+            values.astype(BINARY_DTYPE).tofile(f)
+            written += len(chunk)
+
+    return written
+
+
+def load_binary(path: str | os.PathLike[str]) -> npt.NDArray[np.int32]:
+    """
+    Memory maps a file written by `to_binary` as a read only array
+    that can be passed straight to `number_of_increases` and
+    `number_of_grouped_increases`.
+
+    Args:
+        path (str | os.PathLike[str]): The binary readings file.
+
+    Returns:
+        npt.NDArray[np.int32]: The readings, backed by the file on disk.
+    """
+    size = os.path.getsize(path)
+    if size % BINARY_DTYPE.itemsize:
+        raise ValueError(f"{os.fspath(path)!r} is not a packed readings file")
+
+    if size == 0:
+        # Can't mmap an empty file
+        return np.empty(0, dtype=BINARY_DTYPE)
+
+    return np.memmap(path, dtype=BINARY_DTYPE, mode="r")
+
+
+@dataclass
+class _ChunkSummary:
+    """
+    Everything needed to stitch the counts for a contiguous chunk
+    of readings onto the chunks either side of it.
+
+    Only the first and last `group_size` readings are kept as those are
+    the only ones that can be compared against another chunk.
+    """
+
+    group_size: int
+    head: list[int] = field(default_factory=list)
+    tail: list[int] = field(default_factory=list)
+    count: int = 0
+    increases: int = 0
+    grouped_increases: int = 0
+
+    @classmethod
+    def from_array(
+        cls, readings: npt.NDArray[np.integer[Any]], group_size: int
+    ) -> _ChunkSummary:
+        """
+        Summarise a single chunk of readings.
+        """
+        return _ChunkSummary(
+            group_size=group_size,
+            head=readings[:group_size].tolist(),
+            tail=readings[-group_size:].tolist() if len(readings) else [],
+            count=len(readings),
+            increases=_numpy_number_of_increases(readings),
+            grouped_increases=_numpy_number_of_grouped_increases(readings, group_size),
+        )
+
+    def __add__(self, other: _ChunkSummary) -> _ChunkSummary:
+        """
+        Combine with the chunk immediately after this one.
+        """
+        if not other.count:
+            return self
+        if not self.count:
+            return other
+
+        size = self.group_size
+        increases = self.increases + other.increases
+        grouped_increases = self.grouped_increases + other.grouped_increases
+
+        # The first reading of `other` against our last one
+        if other.head[0] > self.tail[-1]:
+            increases += 1
+
+        # The first few readings of `other` leave a window that started in this chunk
+        joined = self.tail + other.head
+        for entering in range(len(self.tail), len(joined)):
+            leaving = entering - size
+            if leaving >= 0 and joined[entering] > joined[leaving]:
+                grouped_increases += 1
+
+        return _ChunkSummary(
+            group_size=size,
+            head=(self.head + other.head)[:size],
+            tail=(self.tail + other.tail)[-size:],
+            count=self.count + other.count,
+            increases=increases,
+            grouped_increases=grouped_increases,
+        )
+
+
+def _line_ranges(path: str | os.PathLike[str], chunks: int) -> list[tuple[int, int]]:
+    """
+    Splits the file at `path` into (up to) `chunks` byte ranges
+    of roughly equal size, each starting at the beginning of a line.
+    """
+    size = os.path.getsize(path)
+    starts = [0]
+
+    with open(path, "rb") as f:
+        for i in range(1, chunks):
+            # Step back a byte so a boundary already at the start
+            # of a line doesn't skip that whole line
+            f.seek(max(size * i // chunks - 1, starts[-1]))
+            f.readline()
+            start = f.tell()
+            if starts[-1] < start < size:
+                starts.append(start)
+
+    return list(zip(starts, starts[1:] + [size]))
+
+
+def _summarise_range(
+    path: str | os.PathLike[str],
+    start: int,
+    stop: int,
+    group_size: int,
+    block_size: int,
+) -> _ChunkSummary:
+    """
+    Summarise the readings between byte offsets `start` and `stop`
+    of `path`, reading `block_size` bytes at a time.
+    """
+    summary = _ChunkSummary(group_size=group_size)
+    leftover = b""
+
+    with open(path, "rb") as f:
+        f.seek(start)
+        remaining = stop - start
+        while remaining > 0:
+            block = f.read(min(block_size, remaining))
+            if not block:
+                break
+            remaining -= len(block)
+
+            data = leftover + block
+            if remaining > 0:
+                # Hang on to any partial line for the next block
+                cut = data.rfind(b"\n") + 1
+                data, leftover = data[:cut], data[cut:]
+
+            readings = np.array(data.split(), dtype=np.int64)
+            summary += _ChunkSummary.from_array(readings, group_size)
+
+    return summary
+
+
+def parallel_increases(
+    path: str | os.PathLike[str],
+    group_size: int = 3,
+    workers: int | None = None,
+    chunks_per_worker: int = 4,
+    block_size: int = 16 * 1024 * 1024,
+) -> tuple[int, int]:
+    """
+    Counts both the raw and the grouped increases in the text file
+    at `path` using a pool of worker processes.
+
+    The file is split into byte ranges on line boundaries which are
+    each counted by a worker, the per chunk results are then stitched
+    back together in order, including the windows that straddle a boundary.
+
+    Args:
+        path (str | os.PathLike[str]): Text file with one reading per line.
+        group_size (int, optional): Size of the rolling window group.
+            Defaults to 3.
+        workers (int | None, optional): Number of worker processes.
+            Defaults to the number of CPUs.
+        chunks_per_worker (int, optional): Number of chunks to give each
+            worker, more chunks balance the load better. Defaults to 4.
+        block_size (int, optional): Number of bytes each worker reads at a time.
+            Defaults to 16MiB.
+
+    Returns:
+        tuple[int, int]: Number of increases and number of grouped increases.
+    """
+    if group_size < 1:
+        raise ValueError(f"group_size must be at least 1, got {group_size}")
+
+    workers = workers or os.cpu_count() or 1
+    ranges = _line_ranges(path, workers * chunks_per_worker)
+    summarise = functools.partial(
+        _summarise_range, path, group_size=group_size, block_size=block_size
+    )
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        # map keeps the chunks in order which is all we need to stitch them
+        summaries = executor.map(summarise, *zip(*ranges))
+        total = sum(summaries, _ChunkSummary(group_size=group_size))
+
+    return total.increases, total.grouped_increases
 
 
 if __name__ == "__main__":
     HERE = Path(__file__).parent.resolve()
     INPUT = HERE / "day01.txt"
 
+    # Stream the file line by line so memory stays flat no matter how big it is
     with open(INPUT) as f:
-        readings_text = f.read()
-
-    # My puzzle input has 2000 lines, let's make sure we haven't missed any
-    # and cast them to integers
-    readings = [int(reading) for reading in readings_text.splitlines()]
-    assert len(readings) == 2000
+        part1, part2 = stream_increases(f)
 
     # Get my actual answers
-    print(f"Part 1: {number_of_increases(readings)}")
+    print(f"Part 1: {part1}")
     print()
-    print(f"Part 2: {number_of_grouped_increases(readings)}")
+    print(f"Part 2: {part2}")
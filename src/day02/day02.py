@@ -76,8 +76,31 @@ following the planned course. What do you get if you multiply your final horizon
 
 from __future__ import annotations
 
+import array
+import concurrent.futures
+import functools
+import itertools
+import os
 from dataclasses import dataclass
 from pathlib import Path
+from typing import Any, Iterable
+
+import numpy as np
+import numpy.typing as npt
+
+# Compact codes for each direction, used by `Course`
+FORWARD = 0
+UP = 1
+DOWN = 2
+OPCODES = {"forward": FORWARD, "up": UP, "down": DOWN}
+
+# Packed binary movements are 5 byte records: a 1 byte opcode
+# followed by the amount as a little-endian 32 bit signed int
+BINARY_DTYPE = np.dtype([("opcode", "u1"), ("amount", "<i4")])
+AMOUNT_LIMITS = np.iinfo(np.int32)
+
+# Largest value any part of a position can safely reach in numpy
+POSITION_LIMIT = np.iinfo(np.int64).max
 
 
 @dataclass
@@ -148,24 +171,504 @@ class Position:
             self.move(move)
 
 
+def parse_movement(move: str) -> tuple[int, int]:
+    """
+    Parses a 'movement' like `forward 5` into its opcode
+    and amount e.g. (FORWARD, 5).
+    """
+    direction, amount = move.split(" ")
+
+    if not direction or not amount:
+        raise ValueError(f"malformed movement: {move!r}")
+
+    opcode = OPCODES.get(direction)
+    if opcode is None:
+        raise ValueError(f"unhandled movement: {direction!r}")
+
+    return opcode, int(amount)
+
+
+def _might_overflow(
+    forward: npt.NDArray[np.int64],
+    aim_change: npt.NDArray[np.int64],
+    start: Position,
+) -> bool:
+    """
+    Whether following `forward` and `aim_change` from `start` could take
+    any part of the position outside of int64 at any step.
+
+    The worst case is every aim change going the same way before every move
+    forward, so the total forward times the largest possible aim bounds the depth.
+    Worked out in floats so the bound itself can't overflow, with a factor
+    of 2 to spare for their rounding.
+    """
+    total_forward = abs(start.horizontal) + float(
+        np.abs(forward, dtype=np.float64).sum()
+    )
+    max_aim = abs(start.aim) + float(np.abs(aim_change, dtype=np.float64).sum())
+    max_depth = abs(start.depth) + total_forward * max_aim
+    return 2 * max(total_forward, max_aim, max_depth) > POSITION_LIMIT
+
+
+@dataclass
+class Course:
+    """
+    A series of movements compiled down to parallel arrays of
+    opcodes and amounts so they can be applied in bulk with numpy
+    rather than one string at a time.
+
+    Build one with `Course.compile`.
+    """
+
+    opcodes: npt.NDArray[np.uint8]
+    amounts: npt.NDArray[np.signedinteger[Any]]
+
+    def __len__(self) -> int:
+        return len(self.opcodes)
+
+    def __getitem__(self, index: slice) -> Course:
+        """
+        Slicing a `Course` gives the `Course` of just those movements.
+        """
+        return Course(opcodes=self.opcodes[index], amounts=self.amounts[index])
+
+    @classmethod
+    def compile(cls, movements: Iterable[str]) -> Course:
+        """
+        Compile the string representations of some movements
+        e.g. ["forward 5", "up 2", "down 1"] into a `Course`.
+        """
+        opcodes = array.array("B")
+        amounts = array.array("q")
+
+        for move in movements:
+            opcode, amount = parse_movement(move)
+            opcodes.append(opcode)
+            amounts.append(amount)
+
+        return Course(
+            opcodes=np.frombuffer(opcodes, dtype=np.uint8),
+            amounts=np.frombuffer(amounts, dtype=np.int64),
+        )
+
+    def deltas(self) -> tuple[npt.NDArray[np.int64], npt.NDArray[np.int64]]:
+        """
+        Returns the amount each command moves forward by and changes
+        the aim by, one of which will always be 0.
+        """
+        # Amounts from `load_binary` are only 32 bit, which could overflow
+        amounts = self.amounts.astype(np.int64, copy=False)
+        zero = np.zeros_like(amounts)
+        forward = np.where(self.opcodes == FORWARD, amounts, zero)
+        aim = np.where(self.opcodes == DOWN, amounts, zero)
+        aim -= np.where(self.opcodes == UP, amounts, zero)
+        return forward, aim
+
+    def segment(self) -> Segment:
+        """
+        Returns the course summarised as a `Segment`.
+        """
+        end = self.navigate()
+        return Segment(forward=end.horizontal, depth=end.depth, aim=end.aim)
+
+    def navigate(self, start: Position | None = None) -> Position:
+        """
+        Returns the `Position` reached by following the course from
+        `start` (defaults to the origin).
+
+        The same as `Position.apply_movements` but vectorised, the aim at each
+        step is the running total of the aim changes and the depth is then
+        just the sum of each forward amount times the aim at that point.
+
+        Courses big enough that this could overflow int64 are worked out
+        with Python ints instead.
+        """
+        start = start or Position()
+        forward: npt.NDArray[Any]
+        aim_change: npt.NDArray[Any]
+        forward, aim_change = self.deltas()
+
+        if _might_overflow(forward, aim_change, start):
+            # Python ints can't overflow, much slower but always right
+            forward, aim_change = forward.astype(object), aim_change.astype(object)
+
+        aim = start.aim + np.cumsum(aim_change)
+
+        return Position(
+            horizontal=start.horizontal + int(forward.sum()),
+            depth=start.depth + int(np.dot(forward, aim)),
+            aim=int(aim[-1]) if len(aim) else start.aim,
+        )
+
+
+@dataclass(frozen=True)
+class Segment:
+    """
+    The effect of following some run of movements, from any starting position.
+
+    Starting at (horizontal, depth, aim) a segment always ends up at
+    (horizontal + forward, depth + self.depth + aim * forward, aim + self.aim),
+    so it only needs these 3 numbers. Segments can be added together to get
+    the effect of one followed by the other, which means a huge course can be
+    split into pieces, summarised separately and combined afterwards.
+
+    Args:
+        forward (int): Total amount moved forward.
+        depth (int): Depth gained when starting with an aim of 0.
+        aim (int): Total change in aim.
+    """
+
+    forward: int = 0
+    depth: int = 0
+    aim: int = 0
+
+    def __add__(self, other: Segment) -> Segment:
+        """
+        The segment made by following this one then `other`.
+        """
+        return Segment(
+            forward=self.forward + other.forward,
+            depth=self.depth + other.depth + self.aim * other.forward,
+            aim=self.aim + other.aim,
+        )
+
+    def apply(self, start: Position) -> Position:
+        """
+        Returns the `Position` reached by following the segment from `start`.
+        """
+        return Position(
+            horizontal=start.horizontal + self.forward,
+            depth=start.depth + self.depth + start.aim * self.forward,
+            aim=start.aim + self.aim,
+        )
+
+
+@dataclass
+class TrajectoryIndex:
+    """
+    Checkpoints of the position every `interval` movements along a `Course`
+    so the position after any number of movements can be found by replaying
+    at most `interval - 1` of them, rather than the whole course.
+
+    Smaller intervals answer quicker but take more memory, each checkpoint
+    costs 24 bytes.
+
+    Build one with `TrajectoryIndex.build`.
+    """
+
+    course: Course
+    interval: int
+    horizontal: npt.NDArray[np.int64]
+    depth: npt.NDArray[np.int64]
+    aim: npt.NDArray[np.int64]
+
+    @classmethod
+    def build(cls, course: Course, interval: int = 1024) -> TrajectoryIndex:
+        """
+        Build the checkpoints for `course`, one every `interval` movements.
+
+        Raises OverflowError if the checkpoints might not fit in int64.
+        """
+        if interval < 1:
+            raise ValueError(f"interval must be at least 1, got {interval}")
+
+        forward, aim_change = course.deltas()
+        if _might_overflow(forward, aim_change, Position()):
+            raise OverflowError(
+                "course could take the position outside of int64, use Course.navigate"
+            )
+
+        # Position after every movement, with the origin tacked on the front
+        aim = np.concatenate(([0], np.cumsum(aim_change)))
+        horizontal = np.concatenate(([0], np.cumsum(forward)))
+        depth = np.concatenate(([0], np.cumsum(forward * aim[1:])))
+
+        return TrajectoryIndex(
+            course=course,
+            interval=interval,
+            horizontal=horizontal[::interval].copy(),
+            depth=depth[::interval].copy(),
+            aim=aim[::interval].copy(),
+        )
+
+    def position_at(self, moves: int) -> Position:
+        """
+        Returns the `Position` after the first `moves` movements of the course.
+        """
+        if not 0 <= moves <= len(self.course):
+            raise ValueError(
+                f"moves must be between 0 and {len(self.course)}, got {moves}"
+            )
+
+        checkpoint = moves // self.interval
+        start = Position(
+            horizontal=int(self.horizontal[checkpoint]),
+            depth=int(self.depth[checkpoint]),
+            aim=int(self.aim[checkpoint]),
+        )
+
+        replay = self.course[checkpoint * self.interval : moves]
+        return replay.navigate(start)
+
+    def save(self, path: str | os.PathLike[str]) -> None:
+        """
+        Save the checkpoints to `path` (an uncompressed numpy .npz file),
+        the course itself isn't saved as it's already in the log.
+        """
+        # Pass a file object so numpy doesn't tack on an extra .npz suffix
+        with open(path, "wb") as f:
+            np.savez(
+                f,
+                interval=self.interval,
+                length=len(self.course),
+                horizontal=self.horizontal,
+                depth=self.depth,
+                aim=self.aim,
+            )
+
+    @classmethod
+    def load(cls, path: str | os.PathLike[str], course: Course) -> TrajectoryIndex:
+        """
+        Load the checkpoints written by `save` for `course`.
+        """
+        with np.load(path) as data:
+            if int(data["length"]) != len(course):
+                raise ValueError(
+                    f"index is for {int(data['length'])} movements, course has {len(course)}"
+                )
+
+            return TrajectoryIndex(
+                course=course,
+                interval=int(data["interval"]),
+                horizontal=data["horizontal"],
+                depth=data["depth"],
+                aim=data["aim"],
+            )
+
+
+def _movement_ranges(
+    path: str | os.PathLike[str], chunks: int
+) -> list[tuple[int, int]]:
+    """
+    Splits the movements file at `path` into (up to) `chunks` byte ranges
+    of roughly equal size so that no movement is split between two of them.
+    """
+    size = os.path.getsize(path)
+    starts = [0]
+
+    with open(path, "rb") as f:
+        for i in range(1, chunks):
+            # Each range starts after the end of the movement the even split
+            # lands in, backing up a byte first means a split landing right
+            # at the start of a movement keeps it rather than skipping to the next
+            f.seek(max(size * i // chunks - 1, starts[-1]))
+            f.readline()
+            start = f.tell()
+            if starts[-1] < start < size:
+                starts.append(start)
+
+    return list(zip(starts, starts[1:] + [size]))
+
+
+def _summarise_range(
+    path: str | os.PathLike[str], start: int, stop: int, block_size: int
+) -> Segment:
+    """
+    Summarise the movements between byte offsets `start` and `stop`
+    of `path` as a `Segment`, reading `block_size` bytes at a time.
+    """
+    segment = Segment()
+    leftover = b""
+
+    with open(path, "rb") as f:
+        f.seek(start)
+        remaining = stop - start
+        while remaining > 0:
+            block = f.read(min(block_size, remaining))
+            if not block:
+                break
+            remaining -= len(block)
+
+            data = leftover + block
+            if remaining > 0:
+                # The last movement might carry on into the next block
+                cut = data.rfind(b"\n") + 1
+                data, leftover = data[:cut], data[cut:]
+
+            movements = (line for line in data.decode().splitlines() if line)
+            segment += Course.compile(movements).segment()
+
+    return segment
+
+
+def parallel_navigate(
+    path: str | os.PathLike[str],
+    start: Position | None = None,
+    workers: int | None = None,
+    chunks_per_worker: int = 4,
+    block_size: int = 16 * 1024 * 1024,
+) -> Position:
+    """
+    Returns the `Position` reached by following the movements in the
+    text file at `path` from `start` (defaults to the origin), using a
+    pool of worker processes.
+
+    The file is split into byte ranges on line boundaries, each of which
+    is reduced to a `Segment` by a worker, the segments are then added
+    together in order and applied to `start`.
+
+    Args:
+        path (str | os.PathLike[str]): Text file with one movement per line.
+        start (Position | None, optional): Where to start from.
+            Defaults to the origin.
+        workers (int | None, optional): Number of worker processes.
+            Defaults to the number of CPUs.
+        chunks_per_worker (int, optional): Number of ranges of the file to
+            give each worker, more ranges share the work out more evenly but
+            each one adds a `Segment` to combine. Defaults to 4.
+        block_size (int, optional): Number of bytes of movements each worker
+            compiles into a `Course` at a time. Defaults to 16MiB.
+
+    Returns:
+        Position: The final position.
+    """
+    workers = workers or os.cpu_count() or 1
+    ranges = _movement_ranges(path, workers * chunks_per_worker)
+    summarise = functools.partial(_summarise_range, path, block_size=block_size)
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        # map keeps the chunks in order, which matters as segments don't commute
+        segments = executor.map(summarise, *zip(*ranges))
+        total = sum(segments, Segment())
+
+    return total.apply(start or Position())
+
+
+def to_binary(
+    movements: Iterable[str],
+    path: str | os.PathLike[str],
+    append: bool = False,
+    chunk_size: int = 65_536,
+) -> int:
+    """
+    Writes `movements` to `path` as packed 5 byte records (see `BINARY_DTYPE`)
+    so they can be memory mapped with `load_binary` rather than parsed
+    from text every time.
+
+    Args:
+        movements (Iterable[str]): The movements e.g. ["forward 5", "up 2"].
+        path (str | os.PathLike[str]): Where to write the binary file.
+        append (bool, optional): Add to the end of an existing file rather
+            than overwriting it, e.g. for a live stream of movements.
+            Defaults to False.
+        chunk_size (int, optional): Number of movements to convert at a time.
+            Defaults to 65_536.
+
+    Returns:
+        int: Number of movements written.
+    """
+    lines = (move for move in movements if move.strip())
+    written = 0
+
+    with open(path, "ab" if append else "wb") as f:
+        while chunk := list(itertools.islice(lines, chunk_size)):
+            course = Course.compile(move.strip() for move in chunk)
+            records = np.empty(len(course), dtype=BINARY_DTYPE)
+            if len(course) and not (
+                AMOUNT_LIMITS.min <= course.amounts.min()
+                and course.amounts.max() <= AMOUNT_LIMITS.max
+            ):
+                raise ValueError("movement amount too big for the binary format")
+
+            records["opcode"] = course.opcodes
+            records["amount"] = course.amounts
+            records.tofile(f)
+            written += len(course)
+
+    return written
+
+
+def load_binary(path: str | os.PathLike[str]) -> Course:
+    """
+    Memory maps a file written by `to_binary` as a `Course`, the opcodes
+    and amounts are read only views straight onto the file.
+
+    Args:
+        path (str | os.PathLike[str]): The binary movements file.
+
+    Returns:
+        Course: The movements, backed by the file on disk.
+    """
+    size = os.path.getsize(path)
+    if size % BINARY_DTYPE.itemsize:
+        raise ValueError(f"{os.fspath(path)!r} is not a packed movements file")
+
+    if size == 0:
+        # Can't mmap an empty file
+        records = np.empty(0, dtype=BINARY_DTYPE)
+    else:
+        records = np.memmap(path, dtype=BINARY_DTYPE, mode="r")
+
+    return Course(opcodes=records["opcode"], amounts=records["amount"])
+
+
+def stream_solve(movements: Iterable[str]) -> tuple[Position, Position]:
+    """
+    Follows `movements` (e.g. the lines of an open file) in a single pass,
+    working out where you end up under both the part 1 and the part 2 rules.
+
+    Handy because `Position` only does part 2 now, and nothing but the
+    current line is ever held in memory.
+
+    It turns out the part 1 depth is exactly the part 2 aim (both go up
+    with down and down with up), so the only extra work for part 2 is
+    the depth from forward * aim.
+
+    Args:
+        movements (Iterable[str]): The movements e.g. ["forward 5", "up 2"].
+
+    Returns:
+        tuple[Position, Position]: The final part 1 and part 2 positions.
+    """
+    # Plain locals rather than updating a `Position` as it's a lot quicker
+    horizontal = 0
+    depth = 0
+    aim = 0
+
+    for move in movements:
+        parts = move.split()
+        if not parts:
+            # Blank lines e.g. a trailing newline at the end of a file
+            continue
+
+        if len(parts) != 2:
+            raise ValueError(f"malformed movement: {move!r}")
+
+        direction, amount = parts[0], int(parts[1])
+        if direction == "forward":
+            horizontal += amount
+            depth += aim * amount
+        elif direction == "down":
+            aim += amount
+        elif direction == "up":
+            aim -= amount
+        else:
+            raise ValueError(f"unhandled movement: {direction!r}")
+
+    part1 = Position(horizontal=horizontal, depth=aim)
+    part2 = Position(horizontal=horizontal, depth=depth, aim=aim)
+    return part1, part2
+
+
 if __name__ == "__main__":
     HERE = Path(__file__).parent.resolve()
     INPUT = HERE / "day02.txt"
 
+    # Stream the file line by line, working out both parts at once
     with open(INPUT) as f:
-        movements_text = f.read()
-
-    # Mine has 1000 lines
-    movements = [movement for movement in movements_text.splitlines()]
-    assert len(movements) == 1000
-
-    # Start from 0
-    p = Position()
-
-    # Apply the list of movements
-    p.apply_movements(movements)
+        part1, part2 = stream_solve(f)
 
     # Get my answers
-    # Part 1 was 1714950, I've changed the Position class in place to do part 2
-    # print(f"Part 1: {p.product()}")
-    print(f"Part 2: {p.product()}")
+    print(f"Part 1: {part1.product()}")
+    print()
+    print(f"Part 2: {part2.product()}")
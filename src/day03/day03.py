@@ -124,9 +124,16 @@ then multiply them together. What is the life support rating of the submarine?
 from __future__ import annotations
 
 import collections
+import concurrent.futures
 import copy
-from dataclasses import dataclass
+import functools
+import os
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Iterable
+
+import numpy as np
+import numpy.typing as npt
 
 # Each number in the real input has 12 digits
 INPUT_LEN = 12
@@ -344,6 +351,491 @@ def get_life_support_rating(binaries: list[Binary], length: int) -> int:
     return get_co2_rating(binaries, length) * get_oxygen_rating(binaries, length)
 
 
+@dataclass
+class BitMatrix:
+    """
+    A whole diagnostic report as an (n x width) array of 0s and 1s
+    so the bit counting can be done a column at a time with numpy
+    rather than one `Binary` at a time.
+
+    Args:
+        bits (npt.NDArray[np.uint8]): One row per number in the report.
+    """
+
+    bits: npt.NDArray[np.uint8]
+
+    @property
+    def width(self) -> int:
+        return int(self.bits.shape[1])
+
+    @classmethod
+    def parse(cls, text: str) -> BitMatrix:
+        """
+        Parse the puzzle input (one binary number per line) into a `BitMatrix`.
+        """
+        return BitMatrix.from_lines(text.split())
+
+    @classmethod
+    def from_lines(cls, lines: Iterable[str]) -> BitMatrix:
+        """
+        Construct a `BitMatrix` from the string representations
+        of some binary numbers e.g. ["00100", "11110"].
+        """
+        rows = [line.strip() for line in lines if line.strip()]
+        if not rows:
+            raise ValueError("no binary numbers to parse")
+
+        width = len(rows[0])
+        if any(len(row) != width for row in rows):
+            raise ValueError("binary numbers must all be the same length")
+
+        raw = np.frombuffer("".join(rows).encode(), dtype=np.uint8) - ord("0")
+        if np.any(raw > 1):
+            raise ValueError("binary numbers can only contain 0s and 1s")
+
+        return BitMatrix(bits=raw.reshape(len(rows), width))
+
+    @classmethod
+    def from_binaries(cls, binaries: list[Binary]) -> BitMatrix:
+        """
+        Construct a `BitMatrix` from a list of `Binary`.
+        """
+        return BitMatrix.from_lines(binary.raw for binary in binaries)
+
+    def column_counts(self) -> npt.NDArray[np.int64]:
+        """
+        Returns the number of 1s in each column.
+        """
+        counts: npt.NDArray[np.int64] = self.bits.sum(axis=0, dtype=np.int64)
+        return counts
+
+    def gamma_bits(self) -> npt.NDArray[np.uint8]:
+        """
+        Returns the most common bit in each column, preferring 1s on a tie.
+        """
+        ones = self.column_counts()
+        return (2 * ones >= len(self.bits)).astype(np.uint8)
+
+    def gamma_rate(self) -> int:
+        return _bits_to_int(self.gamma_bits())
+
+    def epsilon_rate(self) -> int:
+        # Least common is just the opposite of the most common
+        return _bits_to_int(1 - self.gamma_bits())
+
+    def power_consumption(self) -> int:
+        return self.gamma_rate() * self.epsilon_rate()
+
+    def _rating(self, prefer_most_common: bool) -> int:
+        """
+        Filters the rows a column at a time until only one is left,
+        keeping either the most or least common bit in each column.
+        """
+        # Indices of the rows still in the running
+        candidates = np.arange(len(self.bits))
+
+        for column in range(self.width):
+            if len(candidates) == 1:
+                break
+
+            bits = self.bits[candidates, column]
+            ones = int(np.count_nonzero(bits))
+            most_common = 1 if 2 * ones >= len(bits) else 0
+            keep = most_common if prefer_most_common else 1 - most_common
+
+            matches = candidates[bits == keep]
+            # If every candidate has the same bit here then nothing is the
+            # least common so just keep them all (this was the cause of the weird
+            # 50/50 corner case in the `Binary` version above)
+            if len(matches):
+                candidates = matches
+
+        return _bits_to_int(self.bits[candidates[0]])
+
+    def oxygen_rating(self) -> int:
+        return self._rating(prefer_most_common=True)
+
+    def co2_rating(self) -> int:
+        return self._rating(prefer_most_common=False)
+
+    def life_support_rating(self) -> int:
+        return self.oxygen_rating() * self.co2_rating()
+
+
+@dataclass
+class BitTrie:
+    """
+    A binary trie of the numbers in a diagnostic report where every node
+    knows how many numbers pass through it, so each rating is a single
+    walk from the root choosing the more (or less) popular branch at each
+    bit rather than repeatedly filtering the whole list.
+
+    The nodes are stored in flat lists indexed by node number with the root
+    at 0, `zero[node]` and `one[node]` are its children (0 if there isn't one)
+    and `counts[node]` is the number of numbers under it.
+
+    Args:
+        width (int): Number of bits in each number.
+    """
+
+    width: int
+    zero: list[int] = field(default_factory=lambda: [0])
+    one: list[int] = field(default_factory=lambda: [0])
+    counts: list[int] = field(default_factory=lambda: [0])
+
+    def __len__(self) -> int:
+        return self.counts[0]
+
+    @classmethod
+    def from_binaries(cls, binaries: list[Binary]) -> BitTrie:
+        """
+        Construct a `BitTrie` from a (non empty) list of `Binary`.
+        """
+        if not binaries:
+            raise ValueError("need at least one binary number to build a trie")
+
+        trie = BitTrie(width=len(binaries[0].raw))
+        for binary in binaries:
+            trie.insert(binary.raw)
+
+        return trie
+
+    def insert(self, raw: str) -> None:
+        """
+        Add a number to the trie from its string representation e.g. "11001".
+        """
+        if len(raw) != self.width:
+            raise ValueError(f"expected {self.width} bits, got {raw!r}")
+
+        node = 0
+        self.counts[node] += 1
+        for char in raw:
+            if char not in "01":
+                raise ValueError(f"invalid binary number: {raw!r}")
+
+            children = self.one if char == "1" else self.zero
+            if not children[node]:
+                # Brand new branch
+                children[node] = len(self.counts)
+                self.zero.append(0)
+                self.one.append(0)
+                self.counts.append(0)
+
+            node = children[node]
+            self.counts[node] += 1
+
+    def _rating(self, prefer_most_common: bool) -> int:
+        """
+        Walks down from the root taking either the most or least
+        common branch at each bit.
+        """
+        if not len(self):
+            raise ValueError("can't get a rating from an empty trie")
+
+        node = 0
+        value = 0
+        for _ in range(self.width):
+            zero, one = self.zero[node], self.one[node]
+            zeros = self.counts[zero] if zero else 0
+            ones = self.counts[one] if one else 0
+
+            if not zeros or not ones:
+                # Only one way to go
+                take_one = bool(ones)
+            elif prefer_most_common:
+                take_one = ones >= zeros
+            else:
+                take_one = ones < zeros
+
+            node = one if take_one else zero
+            value = (value << 1) | take_one
+
+        return value
+
+    def oxygen_rating(self) -> int:
+        return self._rating(prefer_most_common=True)
+
+    def co2_rating(self) -> int:
+        return self._rating(prefer_most_common=False)
+
+    def life_support_rating(self) -> int:
+        return self.oxygen_rating() * self.co2_rating()
+
+
+@dataclass
+class BitSlices:
+    """
+    A diagnostic report stored a column at a time, each column being one
+    (arbitrarily large) int with bit `i` set if number `i` in the report
+    has a 1 in that column.
+
+    Counting the 1s in a column is then just `int.bit_count`, and filtering
+    down to the rows with a particular bit is a bitwise AND against a mask
+    of the rows still in the running, so there's no limit on the width.
+
+    Args:
+        width (int): Number of bits in each number.
+        count (int): Number of numbers in the report.
+        columns (list[int]): The bit slice for each column, left to right.
+    """
+
+    width: int
+    count: int
+    columns: list[int]
+
+    @classmethod
+    def parse(cls, text: str) -> BitSlices:
+        """
+        Parse the puzzle input (one binary number per line) into `BitSlices`,
+        the width is taken from the input.
+        """
+        return BitSlices.from_lines(text.split())
+
+    @classmethod
+    def from_lines(cls, lines: Iterable[str]) -> BitSlices:
+        """
+        Construct `BitSlices` from the string representations
+        of some binary numbers e.g. ["00100", "11110"].
+        """
+        rows = [line.strip() for line in lines if line.strip()]
+        if not rows:
+            raise ValueError("no binary numbers to parse")
+
+        width = len(rows[0])
+        if any(len(row) != width for row in rows):
+            raise ValueError("binary numbers must all be the same length")
+
+        # int(column, 2) alone would let through things like "_", "+" or spaces
+        if any(not set(row) <= {"0", "1"} for row in rows):
+            raise ValueError("binary numbers can only contain 0s and 1s")
+
+        # zip(*rows) gives us each column as a string, reversed so
+        # that the first row ends up as the lowest bit
+        columns = ["".join(column)[::-1] for column in zip(*rows)]
+        return BitSlices(
+            width=width,
+            count=len(rows),
+            columns=[int(column, 2) for column in columns],
+        )
+
+    def _row(self, index: int) -> int:
+        """
+        Returns the decimal value of the number at `index` in the report.
+        """
+        value = 0
+        for column in self.columns:
+            value = (value << 1) | (column >> index) & 1
+        return value
+
+    def gamma_rate(self) -> int:
+        """
+        Most common bit in each column, preferring 1s on a tie.
+        """
+        value = 0
+        for column in self.columns:
+            value = (value << 1) | (2 * column.bit_count() >= self.count)
+        return value
+
+    def epsilon_rate(self) -> int:
+        # Least common is just the opposite of the most common
+        return self.gamma_rate() ^ ((1 << self.width) - 1)
+
+    def power_consumption(self) -> int:
+        return self.gamma_rate() * self.epsilon_rate()
+
+    def _rating(self, prefer_most_common: bool) -> int:
+        """
+        Filters the rows a column at a time until only one is left,
+        keeping either the most or least common bit in each column.
+        """
+        if not self.count:
+            raise ValueError("can't get a rating from an empty report")
+
+        # Bit i is set while row i is still in the running
+        live = (1 << self.count) - 1
+        remaining = self.count
+
+        for column in self.columns:
+            if remaining == 1:
+                break
+
+            ones = column & live
+            zeros = live & ~column
+            most_common_is_one = 2 * ones.bit_count() >= remaining
+            keep = ones if most_common_is_one == prefer_most_common else zeros
+
+            # If every candidate has the same bit here, just keep them all
+            if keep:
+                live = keep
+                remaining = live.bit_count()
+
+        # Lowest remaining row
+        return self._row((live & -live).bit_length() - 1)
+
+    def oxygen_rating(self) -> int:
+        return self._rating(prefer_most_common=True)
+
+    def co2_rating(self) -> int:
+        return self._rating(prefer_most_common=False)
+
+    def life_support_rating(self) -> int:
+        return self.oxygen_rating() * self.co2_rating()
+
+
+def _bits_to_int(bits: npt.NDArray[np.uint8]) -> int:
+    """
+    Returns the decimal representation of an array of 1s and 0s.
+    """
+    return int("".join(str(bit) for bit in bits.tolist()) or "0", 2)
+
+
+def _line_format(path: str | os.PathLike[str]) -> tuple[int, bytes]:
+    """
+    Returns the number of bits in the first line of the report at `path`
+    and the line ending it uses, either b"\n" or b"\r\n".
+    """
+    with open(path, "rb") as f:
+        line = f.readline()
+
+    newline = b"\r\n" if line.endswith(b"\r\n") else b"\n"
+    return len(line.rstrip(b"\r\n")), newline
+
+
+def _content_size(path: str | os.PathLike[str], block_size: int = 4096) -> int:
+    """
+    Returns the size in bytes of the report at `path`, not counting
+    any blank lines or line endings at the very end.
+    """
+    size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        while size > 0:
+            f.seek(max(size - block_size, 0))
+            tail = f.read(size - f.tell())
+            stripped = tail.rstrip(b"\r\n")
+            size -= len(tail) - len(stripped)
+            if stripped:
+                break
+
+    return size
+
+
+def _count_range(
+    path: str | os.PathLike[str],
+    start: int,
+    stop: int,
+    width: int,
+    block_size: int,
+    newline: bytes = b"\n",
+) -> npt.NDArray[np.int64]:
+    """
+    Counts the 1s in each column of the report at `path` between byte
+    offsets `start` and `stop`, which must both be on line boundaries.
+    """
+    stride = width + len(newline)
+    # Whole number of lines per read so we never split one
+    block_size = max(block_size // stride, 1) * stride
+    counts = np.zeros(width, dtype=np.int64)
+    ending = np.frombuffer(newline, dtype=np.uint8)
+
+    with open(path, "rb") as f:
+        f.seek(start)
+        remaining = stop - start
+        while remaining > 0:
+            block = f.read(min(block_size, remaining))
+            if not block:
+                break
+            remaining -= len(block)
+
+            if len(block) % stride == width:
+                # Last line of the file with no trailing newline
+                block += newline
+            if len(block) % stride:
+                raise ValueError("binary numbers must all be the same length")
+
+            rows = np.frombuffer(block, dtype=np.uint8).reshape(-1, stride)
+            if np.any(rows[:, width:] != ending):
+                raise ValueError("binary numbers must all be the same length")
+
+            bits = rows[:, :width] - np.uint8(ord("0"))
+            if np.any(bits > 1):
+                raise ValueError("binary numbers can only contain 0s and 1s")
+
+            counts += np.count_nonzero(bits, axis=0)
+
+    return counts
+
+
+def parallel_column_counts(
+    path: str | os.PathLike[str],
+    workers: int | None = None,
+    chunks_per_worker: int = 4,
+    block_size: int = 16 * 1024 * 1024,
+) -> tuple[list[int], int]:
+    """
+    Counts the 1s in every column of the report at `path` without ever
+    holding the whole thing, using a pool of worker processes.
+
+    Every line is the same length so the file can be split into byte ranges
+    on line boundaries with some simple arithmetic (lines can end in either
+    LF or CRLF so long as they all end the same way, and any blank lines
+    at the very end are ignored). Each worker reads its
+    range in big blocks, views them as a (lines x line length) array of
+    bytes and counts the b"1"s in each column, the counts are then added up.
+
+    Args:
+        path (str | os.PathLike[str]): The report, one binary number per line.
+        workers (int | None, optional): Number of worker processes.
+            Defaults to the number of CPUs.
+        chunks_per_worker (int, optional): Number of runs of whole lines to
+            give each worker, more runs share the counting out more evenly.
+            Defaults to 4.
+        block_size (int, optional): Roughly how many bytes each worker views
+            as an array at once, rounded down to whole lines. Defaults to 16MiB.
+
+    Returns:
+        tuple[list[int], int]: Number of 1s in each column and number of lines.
+    """
+    width, newline = _line_format(path)
+    if not width:
+        raise ValueError("no binary numbers to count")
+
+    stride = width + len(newline)
+    size = _content_size(path)
+    lines = -(-size // stride)
+
+    workers = workers or os.cpu_count() or 1
+    chunks = min(workers * chunks_per_worker, lines)
+    starts = [lines * i // chunks * stride for i in range(chunks)]
+    stops = starts[1:] + [size]
+
+    count = functools.partial(
+        _count_range, path, width=width, block_size=block_size, newline=newline
+    )
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        total = sum(executor.map(count, starts, stops), np.zeros(width, dtype=np.int64))
+
+    return [int(ones) for ones in total], lines
+
+
+def stream_power_consumption(
+    path: str | os.PathLike[str], workers: int | None = None
+) -> int:
+    """
+    Returns the power consumption of the report at `path`,
+    see `parallel_column_counts`.
+    """
+    counts, lines = parallel_column_counts(path, workers=workers)
+
+    # Most common bit in each column, preferring 1s on a tie
+    gamma = 0
+    for ones in counts:
+        gamma = (gamma << 1) | (2 * ones >= lines)
+
+    epsilon = gamma ^ ((1 << len(counts)) - 1)
+    return gamma * epsilon
+
+
 if __name__ == "__main__":
     HERE = Path(__file__).parent.resolve()
     INPUT = HERE / "day03.txt"
@@ -351,10 +843,11 @@ if __name__ == "__main__":
     with open(INPUT) as f:
         binaries_text = f.read()
 
-    # Mine has 1000 lines
-    binaries = [Binary.from_item(binary) for binary in binaries_text.splitlines()]
-    assert len(binaries) == 1000
+    # Bit slices work out the width for themselves so there's
+    # no need for INPUT_LEN any more
+    report = BitSlices.parse(binaries_text)
+    assert report.width == INPUT_LEN
 
-    print(f"Part 1: {get_power_consumption(binaries, INPUT_LEN)}")
+    print(f"Part 1: {report.power_consumption()}")
     print()
-    print(f"Part 2: {get_life_support_rating(binaries, INPUT_LEN)}")
+    print(f"Part 2: {report.life_support_rating()}")
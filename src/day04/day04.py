@@ -92,8 +92,16 @@ Figure out which board will win last. Once it wins, what would its final score b
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+import concurrent.futures
+import functools
+import os
+import types
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Any, Iterable, Iterator, Mapping
+
+import numpy as np
+import numpy.typing as npt
 
 
 @dataclass
@@ -139,10 +147,260 @@ class Board:
         return Board(grid)
 
 
+@dataclass
+class CellIndex:
+    """
+    Maps every number to the cells it appears in across all the boards,
+    so a drawn number only touches the boards that actually have it.
+
+    Each board's rows and columns get a slot in one flat list of counters,
+    starting at `row_offsets[board]` and `col_offsets[board]` respectively.
+
+    Args:
+        cells (dict[int, list[tuple[int, int, int]]]): The (board, row, col)
+            of every cell holding each number.
+        shapes (list[tuple[int, int]]): The (rows, cols) of each board.
+        row_offsets (list[int]): Where each board's rows start in the row counters.
+        col_offsets (list[int]): Where each board's cols start in the col counters.
+        totals (list[int]): The sum of every number on each board.
+    """
+
+    cells: dict[int, list[tuple[int, int, int]]]
+    shapes: list[tuple[int, int]]
+    row_offsets: list[int]
+    col_offsets: list[int]
+    totals: list[int]
+
+    @classmethod
+    def build(cls, boards: list[Board]) -> CellIndex:
+        """
+        Index the numbers on `boards`.
+        """
+        cells: dict[int, list[tuple[int, int, int]]] = {}
+        shapes: list[tuple[int, int]] = []
+        row_offsets: list[int] = []
+        col_offsets: list[int] = []
+        totals: list[int] = []
+        rows = cols = 0
+
+        for b, board in enumerate(boards):
+            shapes.append((board.num_rows, board.num_cols))
+            row_offsets.append(rows)
+            col_offsets.append(cols)
+            rows += board.num_rows
+            cols += board.num_cols
+            totals.append(sum(n for row in board.grid for n in row if n != -1))
+
+            for i, row in enumerate(board.grid):
+                for j, number in enumerate(row):
+                    cells.setdefault(number, []).append((b, i, j))
+
+        return CellIndex(cells, shapes, row_offsets, col_offsets, totals)
+
+
+@dataclass
+class LiveGame:
+    """
+    Plays a `Game` one draw at a time using its `CellIndex`, reporting
+    boards as soon as they win.
+
+    The work for each draw is proportional to how many times the number
+    appears on the boards, regardless of how many boards there are.
+    Get one from `Game.live`.
+    """
+
+    index: CellIndex
+    row_counts: list[int]
+    col_counts: list[int]
+    unmarked: list[int]
+    won: list[bool]
+    drawn: set[int] = field(default_factory=set)
+
+    @classmethod
+    def from_index(cls, index: CellIndex) -> LiveGame:
+        rows = sum(r for r, _ in index.shapes)
+        cols = sum(c for _, c in index.shapes)
+        return LiveGame(
+            index=index,
+            row_counts=[0] * rows,
+            col_counts=[0] * cols,
+            unmarked=list(index.totals),
+            won=[False] * len(index.shapes),
+        )
+
+    def draw(self, number: int) -> list[tuple[int, int]]:
+        """
+        Mark `number` on every board that has it, returning the
+        (board, score) of every board that wins because of it.
+        """
+        if number in self.drawn:
+            # Already marked everywhere
+            return []
+        self.drawn.add(number)
+
+        winners: list[int] = []
+        for board, i, j in self.index.cells.get(number, []):
+            num_rows, num_cols = self.index.shapes[board]
+            row = self.index.row_offsets[board] + i
+            col = self.index.col_offsets[board] + j
+
+            self.row_counts[row] += 1
+            self.col_counts[col] += 1
+            self.unmarked[board] -= number
+
+            if not self.won[board] and (
+                self.row_counts[row] == num_cols or self.col_counts[col] == num_rows
+            ):
+                self.won[board] = True
+                winners.append(board)
+
+        # Score after all the marking in case a number is on a board twice
+        return [(board, number * self.unmarked[board]) for board in sorted(winners)]
+
+    def play(self, numbers: Iterable[int]) -> Iterator[tuple[int, int, int]]:
+        """
+        Draws `numbers` in order, yielding the (board, number, score)
+        of each board as it wins.
+        """
+        for number in numbers:
+            for board, score in self.draw(number):
+                yield board, number, score
+
+
+@dataclass(frozen=True)
+class BoardStore:
+    """
+    An immutable copy of a set of parsed boards that any number of
+    draw orders can be simulated against without reparsing or copying.
+
+    The only state a simulation needs is one int per board with bit
+    `row * cols + col` set once that cell is marked, a line is complete
+    when all the bits in its mask are set.
+
+    Build one with `BoardStore.from_game`.
+
+    Args:
+        grids (tuple[tuple[int, ...], ...]): Each board's numbers, row by row.
+        row_masks (tuple[tuple[int, ...], ...]): Each board's row bitmasks.
+        col_masks (tuple[tuple[int, ...], ...]): Each board's column bitmasks.
+        cells (Mapping[int, tuple[tuple[int, int], ...]]): Read only map of
+            the (board, bit) of every cell holding each number. It's worked out
+            from the grids so is left out of hashing and equality.
+    """
+
+    grids: tuple[tuple[int, ...], ...]
+    row_masks: tuple[tuple[int, ...], ...]
+    col_masks: tuple[tuple[int, ...], ...]
+    cells: Mapping[int, tuple[tuple[int, int], ...]] = field(hash=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # A read only view of a private copy so the cells can't be changed from outside
+        cells = types.MappingProxyType(dict(self.cells))
+        object.__setattr__(self, "cells", cells)
+
+    @classmethod
+    def from_game(cls, game: Game) -> BoardStore:
+        """
+        Store the boards from an unplayed `Game`.
+        """
+        grids: list[tuple[int, ...]] = []
+        row_masks: list[tuple[int, ...]] = []
+        col_masks: list[tuple[int, ...]] = []
+        cells: dict[int, list[tuple[int, int]]] = {}
+
+        for b, board in enumerate(game.boards):
+            rows, cols = board.num_rows, board.num_cols
+            flat = tuple(number for row in board.grid for number in row)
+            if -1 in flat:
+                raise ValueError("can't store a board that's already been played")
+
+            grids.append(flat)
+            full_row = (1 << cols) - 1
+            row_masks.append(tuple(full_row << (i * cols) for i in range(rows)))
+            full_col = sum(1 << (i * cols) for i in range(rows))
+            col_masks.append(tuple(full_col << j for j in range(cols)))
+
+            for bit, number in enumerate(flat):
+                cells.setdefault(number, []).append((b, bit))
+
+        return BoardStore(
+            grids=tuple(grids),
+            row_masks=tuple(row_masks),
+            col_masks=tuple(col_masks),
+            cells={number: tuple(places) for number, places in cells.items()},
+        )
+
+    def score(self, board: int, marks: int, number: int) -> int:
+        """
+        Score of `board` with `marks` set when `number` was just drawn.
+        """
+        grid = self.grids[board]
+        unmarked = sum(n for bit, n in enumerate(grid) if not marks >> bit & 1)
+        return number * unmarked
+
+    def simulate(self, numbers: Iterable[int]) -> Iterator[tuple[int, int, int]]:
+        """
+        Draws `numbers` in order against a fresh set of marks, yielding
+        the (board, number, score) of each board as it wins.
+
+        The boards themselves are never touched so this can be called
+        again with any other order.
+        """
+        marks = [0] * len(self.grids)
+        won = [False] * len(self.grids)
+
+        for number in numbers:
+            winners: list[int] = []
+            for board, bit in self.cells.get(number, ()):
+                marks[board] |= 1 << bit
+                if won[board]:
+                    continue
+
+                cols = len(self.col_masks[board])
+                row_mask = self.row_masks[board][bit // cols]
+                col_mask = self.col_masks[board][bit % cols]
+                if (
+                    marks[board] & row_mask == row_mask
+                    or marks[board] & col_mask == col_mask
+                ):
+                    won[board] = True
+                    winners.append(board)
+
+            for board in sorted(winners):
+                yield board, number, self.score(board, marks[board], number)
+
+    def first(self, numbers: Iterable[int]) -> int:
+        """
+        Score of the first board to win with draw order `numbers`.
+        """
+        for _, _, score in self.simulate(numbers):
+            return score
+        raise ValueError("No winner!")
+
+    def last(self, numbers: Iterable[int]) -> int:
+        """
+        Score of the last board to win with draw order `numbers`.
+        """
+        scores = [score for _, _, score in self.simulate(numbers)]
+        if not scores:
+            raise ValueError("no winners!")
+        return scores[-1]
+
+
 @dataclass
 class Game:
     numbers: list[int]
     boards: list[Board]
+    index: CellIndex = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self.index = CellIndex.build(self.boards)
+
+    def live(self) -> LiveGame:
+        """
+        Start a fresh `LiveGame` from the boards as they were at parse time.
+        """
+        return LiveGame.from_index(self.index)
 
     def play(self) -> int:
         """
@@ -191,6 +449,322 @@ class Game:
         return Game(numbers, boards)
 
 
+def _draw_turns(numbers: npt.NDArray[np.int64], largest: int) -> npt.NDArray[np.int64]:
+    """
+    Returns a lookup of the turn each number from 0 to `largest` is first
+    drawn on, anything that's never drawn gets len(numbers).
+    """
+    never = len(numbers)
+    size = max(largest, int(numbers.max(initial=0))) + 1
+
+    # np.unique gives the index of the first occurrence of each number,
+    # so the earliest draw of any repeats is the one that's kept
+    draw_turn = np.full(size, never, dtype=np.int64)
+    values, first = np.unique(numbers, return_index=True)
+    draw_turn[values] = first
+    return draw_turn
+
+
+def _win_turns(
+    grids: npt.NDArray[np.integer[Any]], draw_turn: npt.NDArray[np.int64], never: int
+) -> npt.NDArray[np.int64]:
+    """
+    Returns the turn each of a stack of (boards x rows x cols) `grids` wins on,
+    the earliest of the turns each row or column has its last number drawn.
+    """
+    times = draw_turn[grids]
+    rows = times.max(axis=2).min(axis=1, initial=never)
+    cols = times.max(axis=1).min(axis=1, initial=never)
+    turns: npt.NDArray[np.int64] = np.minimum(rows, cols)
+    return turns
+
+
+@dataclass
+class Standings:
+    """
+    Works out when every board in a `Game` wins without actually playing it.
+
+    Each number is swapped for the turn it gets drawn on, then a line is
+    complete on the turn its last number is drawn (the max over the line)
+    and a board wins on the first turn any of its lines is complete (the min
+    over its lines). That's done for every board at once as one big
+    (boards x rows x cols) array.
+
+    Build them with `Standings.from_game` before the game is played,
+    as playing it marks the boards.
+
+    Args:
+        numbers (list[int]): The numbers in the order they're drawn.
+        grids (npt.NDArray[np.int64]): Every board's grid stacked together.
+        draw_turn (npt.NDArray[np.int64]): The turn each number is drawn on,
+            indexed by number.
+        turns (npt.NDArray[np.int64]): The turn (index into `numbers`) each
+            board wins on, or len(numbers) if it never wins.
+    """
+
+    numbers: list[int]
+    grids: npt.NDArray[np.int64]
+    draw_turn: npt.NDArray[np.int64]
+    turns: npt.NDArray[np.int64]
+
+    @classmethod
+    def from_game(cls, game: Game) -> Standings:
+        """
+        Work out the standings for an unplayed `Game`.
+        """
+        grids = np.array([board.grid for board in game.boards], dtype=np.int64)
+        numbers = np.array(game.numbers, dtype=np.int64)
+        if np.any(grids < 0) or np.any(numbers < 0):
+            raise ValueError(
+                "bingo numbers can't be negative (has the game been played?)"
+            )
+
+        draw_turn = _draw_turns(numbers, largest=int(grids.max(initial=0)))
+
+        return Standings(
+            numbers=list(game.numbers),
+            grids=grids,
+            draw_turn=draw_turn,
+            turns=_win_turns(grids, draw_turn, never=len(numbers)),
+        )
+
+    def winners(self) -> list[int]:
+        """
+        Returns the indices of the boards that win, in the order they win.
+
+        Boards winning on the same turn are in the order they appear
+        in the game, just like when playing it.
+        """
+        order = np.argsort(self.turns, kind="stable")
+        return [int(board) for board in order if self.turns[board] < len(self.numbers)]
+
+    def score(self, board: int) -> int:
+        """
+        Returns the score of `board` on the turn it wins.
+        """
+        turn = int(self.turns[board])
+        if turn >= len(self.numbers):
+            raise ValueError(f"board {board} never wins")
+
+        grid = self.grids[board]
+        unmarked = grid[self.draw_turn[grid] > turn]
+        return self.numbers[turn] * int(unmarked.sum())
+
+    def ranking(self) -> list[tuple[int, int, int]]:
+        """
+        Returns a (board, turn, score) for every board that wins,
+        in the order they win.
+        """
+        return [
+            (board, int(self.turns[board]), self.score(board))
+            for board in self.winners()
+        ]
+
+    def first(self) -> int:
+        """
+        Score of the first board to win.
+        """
+        if winners := self.winners():
+            return self.score(winners[0])
+        raise ValueError("No winner!")
+
+    def last(self) -> int:
+        """
+        Score of the last board to win.
+        """
+        if winners := self.winners():
+            return self.score(winners[-1])
+        raise ValueError("no winners!")
+
+
+# Every shard needs the whole draw order so each tournament worker process
+# gets it once, when it starts, the boards are split into shards and each
+# one is only sent to the worker playing it
+_TOURNAMENT: dict[str, npt.NDArray[Any]] = {}
+
+
+def _init_tournament_worker(
+    numbers: npt.NDArray[np.int64], draw_turn: npt.NDArray[np.int64]
+) -> None:
+    _TOURNAMENT.update(numbers=numbers, draw_turn=draw_turn)
+
+
+def _play_shard(
+    grids: npt.NDArray[np.integer[Any]],
+) -> tuple[npt.NDArray[np.int64], npt.NDArray[np.int64]]:
+    """
+    `_score_shard` for a worker process set up by `_init_tournament_worker`.
+    """
+    return _score_shard(grids, _TOURNAMENT["numbers"], _TOURNAMENT["draw_turn"])
+
+
+def _score_shard(
+    grids: npt.NDArray[np.integer[Any]],
+    numbers: npt.NDArray[np.int64],
+    draw_turn: npt.NDArray[np.int64],
+) -> tuple[npt.NDArray[np.int64], npt.NDArray[np.int64]]:
+    """
+    Returns the win turn and winning score of each board in a shard of `grids`
+    when `numbers` are drawn, see `_draw_turns` for `draw_turn`.
+    """
+    never = len(numbers)
+
+    turns = _win_turns(grids, draw_turn, never)
+
+    # Anything drawn after the winning turn is still unmarked
+    unmarked = np.where(draw_turn[grids] > turns[:, None, None], grids, 0)
+    last_drawn = np.append(numbers, 0)[turns]
+    scores = unmarked.sum(axis=(1, 2), dtype=np.int64) * last_drawn
+
+    return turns, scores
+
+
+@dataclass
+class TournamentResult:
+    """
+    The outcome of a `Tournament`, the turn every board won on
+    (len(numbers) if it never did) and its score when it won (0 if it never did).
+    """
+
+    turns: npt.NDArray[np.int64]
+    scores: npt.NDArray[np.int64]
+    never: int
+
+    def winners(self) -> npt.NDArray[np.intp]:
+        """
+        Returns the indices of the boards that win, in the order they win,
+        boards winning on the same turn are in board order.
+        """
+        order = np.argsort(self.turns, kind="stable")
+        return order[self.turns[order] < self.never]
+
+    def ranking(self, top: int | None = None) -> list[tuple[int, int, int]]:
+        """
+        Returns a (board, turn, score) for the first `top` boards
+        to win (all of them by default), in the order they win.
+        """
+        return [
+            (int(board), int(self.turns[board]), int(self.scores[board]))
+            for board in self.winners()[:top]
+        ]
+
+    def first(self) -> int:
+        """
+        Score of the first board to win.
+        """
+        winners = self.winners()
+        if not len(winners):
+            raise ValueError("No winner!")
+        return int(self.scores[winners[0]])
+
+    def last(self) -> int:
+        """
+        Score of the last board to win.
+        """
+        winners = self.winners()
+        if not len(winners):
+            raise ValueError("no winners!")
+        return int(self.scores[winners[-1]])
+
+
+@dataclass
+class Tournament:
+    """
+    A huge game of bingo, every board is the same size (any rows x cols)
+    and they're all stored in one contiguous (boards x rows x cols) array.
+
+    Playing it splits the boards into shards which are handed out to a pool
+    of worker processes, each working out the win turns and scores for its
+    shard in closed form (see `Standings`), the results are then joined back
+    up in board order.
+
+    Args:
+        numbers (npt.NDArray[np.int64]): The numbers in the order they're drawn.
+        grids (npt.NDArray[np.integer[Any]]): Every board, stacked together.
+    """
+
+    numbers: npt.NDArray[np.int64]
+    grids: npt.NDArray[np.integer[Any]]
+
+    def __post_init__(self) -> None:
+        if self.grids.ndim != 3:
+            raise ValueError(
+                f"grids must be (boards x rows x cols), got {self.grids.shape}"
+            )
+        if np.any(self.numbers < 0) or np.any(self.grids < 0):
+            raise ValueError("bingo numbers can't be negative")
+
+        self.grids = np.ascontiguousarray(self.grids)
+
+    @classmethod
+    def from_game(cls, game: Game) -> Tournament:
+        """
+        Make a `Tournament` out of an unplayed `Game`, whose boards
+        must all be the same size.
+        """
+        return Tournament(
+            numbers=np.array(game.numbers, dtype=np.int64),
+            grids=np.array([board.grid for board in game.boards], dtype=np.int32),
+        )
+
+    @classmethod
+    def random(
+        cls, boards: int, rows: int = 5, cols: int = 5, seed: int | None = None
+    ) -> Tournament:
+        """
+        Make a random `Tournament`, handy for benchmarking.
+
+        The numbers drawn are a shuffle of 0 to 4 * rows * cols, and the
+        boards pick from the same range (repeats allowed, to keep it quick).
+        """
+        rng = np.random.default_rng(seed)
+        pool = 4 * rows * cols
+        return Tournament(
+            numbers=rng.permutation(pool).astype(np.int64),
+            grids=rng.integers(0, pool, size=(boards, rows, cols), dtype=np.int32),
+        )
+
+    def play(
+        self, workers: int | None = None, shard_size: int = 65_536
+    ) -> TournamentResult:
+        """
+        Play every board, using `workers` processes (defaults to the number
+        of CPUs, 1 plays everything in this process) each given `shard_size`
+        boards at a time.
+        """
+        draw_turn = _draw_turns(self.numbers, largest=int(self.grids.max(initial=0)))
+        initargs = (self.numbers, draw_turn)
+
+        # Views so nothing is copied here, only pickled when sent to a worker
+        grids = (
+            self.grids[start : start + shard_size]
+            for start in range(0, len(self.grids), shard_size)
+        )
+
+        workers = workers or os.cpu_count() or 1
+        if workers == 1:
+            # Straight to _score_shard, no need to keep the arrays
+            # around in this process after we're done
+            score = functools.partial(
+                _score_shard, numbers=self.numbers, draw_turn=draw_turn
+            )
+            shards = list(map(score, grids))
+        else:
+            with concurrent.futures.ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_tournament_worker,
+                initargs=initargs,
+            ) as executor:
+                shards = list(executor.map(_play_shard, grids))
+
+        empty = np.empty(0, dtype=np.int64)
+        return TournamentResult(
+            turns=np.concatenate([turns for turns, _ in shards] or [empty]),
+            scores=np.concatenate([scores for _, scores in shards] or [empty]),
+            never=len(self.numbers),
+        )
+
+
 if __name__ == "__main__":
     HERE = Path(__file__).parent.resolve()
     INPUT = HERE / "day04.txt"
@@ -198,9 +772,10 @@ if __name__ == "__main__":
     with open(INPUT) as f:
         text = f.read()
 
-    game = Game.parse(text)
-    score = game.play()
-    score_part_2 = game.play_last()
+    # Both parts fall out of the standings, no need to actually play
+    standings = Standings.from_game(Game.parse(text))
+    score = standings.first()
+    score_part_2 = standings.last()
 
     print(f"Part 1: {score}")
 
@@ -86,10 +86,18 @@ Consider all of the lines. At how many points do at least two lines overlap?
 
 from __future__ import annotations
 
+import bisect
 import collections
-from dataclasses import dataclass
+import concurrent.futures
+import functools
+import itertools
+import os
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Iterable, Iterator
+from typing import Callable, Iterable, Iterator
+
+import numpy as np
+import numpy.typing as npt
 
 
 # Hash is needed so it works with collections.Counter
@@ -135,11 +143,36 @@ class Line:
     def is_vertical(self) -> bool:
         return self.start.x == self.end.x
 
+    def is_45_degrees(self) -> bool:
+        """
+        Whether the line is horizontal, vertical or at exactly 45 degrees.
+        """
+        dx = abs(self.end.x - self.start.x)
+        dy = abs(self.end.y - self.start.y)
+        return dx == 0 or dy == 0 or dx == dy
+
+    def rasterize(self) -> tuple[npt.NDArray[np.int64], npt.NDArray[np.int64]]:
+        """
+        Returns the x and y coordinates of the points covered
+        by the line as arrays, at any slope (see `rasterize`).
+        """
+        return rasterize(
+            np.array(
+                [[self.start.x, self.start.y, self.end.x, self.end.y]], dtype=np.int64
+            )
+        )
+
     def points_covered(self) -> Iterator[Point]:
         """
         Yields the points covered by the calling `Line`
         """
-        if self.is_horizontal():
+        if not self.is_45_degrees():
+            # Any other slope, see `rasterize`
+            xs, ys = self.rasterize()
+            for x, y in zip(xs.tolist(), ys.tolist()):
+                yield Point(x, y)
+
+        elif self.is_horizontal():
             low = min(self.start.x, self.end.x)
             high = max(self.start.x, self.end.x)
 
@@ -174,7 +207,7 @@ class Line:
                 y += 1 if is_positive_gradient else -1
 
 
-def count(lines: Iterable[Line], diagonal: bool = False) -> int:
+def _count_counter(lines: Iterable[Line], diagonal: bool = False) -> int:
     counter = collections.Counter(
         point
         for line in lines
@@ -185,6 +218,667 @@ def count(lines: Iterable[Line], diagonal: bool = False) -> int:
     return sum(count >= 2 for count in counter.values())
 
 
+def endpoints(lines: Iterable[Line], diagonal: bool = False) -> npt.NDArray[np.int64]:
+    """
+    Returns the (x1, y1, x2, y2) of each of `lines` as an (n x 4) array,
+    leaving out the diagonals unless `diagonal` is True.
+    """
+    coords = [
+        (line.start.x, line.start.y, line.end.x, line.end.y)
+        for line in lines
+        if any([diagonal, line.is_horizontal(), line.is_vertical()])
+    ]
+    return np.array(coords, dtype=np.int64).reshape(-1, 4)
+
+
+def rasterize(
+    ends: npt.NDArray[np.int64],
+    first: npt.NDArray[np.int64] | None = None,
+    last: npt.NDArray[np.int64] | None = None,
+) -> tuple[npt.NDArray[np.int64], npt.NDArray[np.int64]]:
+    """
+    Returns the x and y coordinates of every point covered by every line
+    in `ends` (see `endpoints`) as two flat arrays, all in one go.
+
+    Lines can have any slope, each one takes a step of 1 along whichever
+    axis it moves furthest in (the major axis) for every point, and the
+    other coordinate is the nearest whole number to the true line (halves
+    round away from the start). This is what Bresenham's algorithm draws,
+    done for every point at once rather than one at a time, and for
+    horizontal, vertical or 45 degree lines it's exactly the points covered.
+
+    Only steps `first` to `last` (inclusive) of each line are drawn if given,
+    by default that's the whole line, see `clip_to_band`.
+
+    Use `split_lines` to get each line's points back separately.
+    """
+    x1, y1, x2, y2 = ends.T
+    dx, dy = x2 - x1, y2 - y1
+    major = np.maximum(np.abs(dx), np.abs(dy))
+
+    first = np.zeros_like(major) if first is None else first
+    last = major if last is None else last
+    lengths = np.maximum(last - first + 1, 0)
+    starts = np.cumsum(lengths) - lengths
+
+    # Position of each point along its own line
+    steps = np.arange(lengths.sum()) - np.repeat(starts - first, lengths)
+
+    def axis(
+        start: npt.NDArray[np.int64], delta: npt.NDArray[np.int64]
+    ) -> npt.NDArray[np.int64]:
+        # round(step * |delta| / major) without any floats, major is 0 for a
+        # single point line but then so is step so the max is just to avoid / 0
+        distance = np.repeat(np.abs(delta), lengths)
+        span = np.repeat(major, lengths)
+        offset = (2 * steps * distance + span) // (2 * np.maximum(span, 1))
+        coords: npt.NDArray[np.int64] = (
+            np.repeat(start, lengths) + np.repeat(np.sign(delta), lengths) * offset
+        )
+        return coords
+
+    return axis(x1, dx), axis(y1, dy)
+
+
+def split_lines(
+    ends: npt.NDArray[np.int64],
+) -> list[tuple[npt.NDArray[np.int64], npt.NDArray[np.int64]]]:
+    """
+    Same as `rasterize` but returns the x and y coordinates
+    for each line separately.
+    """
+    xs, ys = rasterize(ends)
+    x1, y1, x2, y2 = ends.T
+    lengths = np.maximum(np.abs(x2 - x1), np.abs(y2 - y1)) + 1
+    boundaries = np.cumsum(lengths)[:-1]
+    return list(zip(np.split(xs, boundaries), np.split(ys, boundaries)))
+
+
+def _count_numpy(lines: Iterable[Line], diagonal: bool = False) -> int:
+    """
+    Rasterizes all the lines at once with numpy and counts them up
+    on a dense grid covering every line.
+    """
+    ends = endpoints(lines, diagonal)
+    if not len(ends):
+        return 0
+
+    return _dense_overlaps(*rasterize(ends))
+
+
+def _dense_overlaps(xs: npt.NDArray[np.int64], ys: npt.NDArray[np.int64]) -> int:
+    """
+    Counts the points that appear at least twice in (xs, ys)
+    on a dense grid just big enough to hold them all.
+    """
+    if not len(xs):
+        return 0
+
+    # Shift so the smallest coordinates are 0 then flatten (x, y)
+    # into a single index into the grid
+    xs = xs - xs.min()
+    ys = ys - ys.min()
+    width = int(ys.max()) + 1
+    grid = np.bincount(xs * width + ys)
+
+    return int(np.count_nonzero(grid >= 2))
+
+
+def clip_to_band(
+    ends: npt.NDArray[np.int64], low: int, high: int
+) -> tuple[npt.NDArray[np.int64], npt.NDArray[np.int64], npt.NDArray[np.int64]]:
+    """
+    Clips every line in `ends` (see `endpoints`) to the horizontal band
+    `low` <= y <= `high`, dropping any that miss it entirely.
+
+    Returns the lines that are left along with the first and last step
+    of each that's inside the band, ready to pass to `rasterize`. The lines
+    keep their original ends so they round exactly the same way in every band.
+    """
+    x1, y1, x2, y2 = ends.T
+    dy = y2 - y1
+    rise = np.abs(dy)
+    major = np.maximum(np.abs(x2 - x1), rise)
+
+    # Range of distances (in y) from the start of each line that are in the band
+    near = np.where(dy >= 0, low - y1, y1 - high)
+    far = np.where(dy >= 0, high - y1, y1 - low)
+
+    # Turn that into a range of steps by inverting the rounding in `rasterize`:
+    # the first step rounding to at least `near` and the last rounding to at most `far`.
+    # Lines that don't move in y are either all in or all out
+    per = 2 * np.maximum(rise, 1)
+    first = np.where(rise > 0, -((major - 2 * near * major) // per), 0)
+    last = np.where(rise > 0, -((-(2 * far + 1) * major) // per) - 1, major)
+    flat_inside = (rise > 0) | ((near <= 0) & (0 <= far))
+
+    first = np.maximum(first, 0)
+    last = np.minimum(last, major)
+    keep = flat_inside & (first <= last)
+
+    return ends[keep], first[keep], last[keep]
+
+
+# Every band needs all the lines (each one clips them to itself) so each band
+# worker process is sent them once, when it starts, rather than once for every
+# band it's given, as there are several bands per worker
+_BAND_LINES: dict[str, npt.NDArray[np.int64]] = {}
+
+
+def _init_band_worker(ends: npt.NDArray[np.int64]) -> None:
+    _BAND_LINES["ends"] = ends
+
+
+def _band_overlaps(low: int, high: int) -> int:
+    """
+    `_overlaps_in_band` for a worker process set up by `_init_band_worker`.
+    """
+    return _overlaps_in_band(_BAND_LINES["ends"], low, high)
+
+
+def _overlaps_in_band(ends: npt.NDArray[np.int64], low: int, high: int) -> int:
+    """
+    Counts the overlaps of the lines in `ends` between `low` <= y <= `high`,
+    in its own dense grid.
+    """
+    clipped, first, last = clip_to_band(ends, low, high)
+    if not len(clipped):
+        return 0
+    return _dense_overlaps(*rasterize(clipped, first, last))
+
+
+def parallel_overlaps(
+    ends: npt.NDArray[np.int64],
+    workers: int | None = None,
+    bands_per_worker: int = 4,
+) -> int:
+    """
+    Counts the points covered by at least 2 of the lines in `ends`
+    (see `endpoints`) using a pool of worker processes.
+
+    The plane is split into horizontal bands, every worker clips the lines
+    to its band and rasterizes them into its own count grid. No point is
+    in more than one band so the final answer is just the sum of the bands.
+
+    Args:
+        ends (npt.NDArray[np.int64]): The (x1, y1, x2, y2) of each line.
+        workers (int | None, optional): Number of worker processes.
+            Defaults to the number of CPUs, 1 does it all in this process.
+        bands_per_worker (int, optional): Number of bands to give each
+            worker, more bands balance the load better. Defaults to 4.
+
+    Returns:
+        int: Number of points covered at least twice.
+    """
+    if not len(ends):
+        return 0
+
+    workers = workers or os.cpu_count() or 1
+    low = int(min(ends[:, 1].min(), ends[:, 3].min()))
+    high = int(max(ends[:, 1].max(), ends[:, 3].max()))
+
+    bands = min(workers * bands_per_worker, high - low + 1)
+    edges = [low + (high - low + 1) * i // bands for i in range(bands + 1)]
+    lows = edges[:-1]
+    highs = [edge - 1 for edge in edges[1:]]
+
+    if workers == 1:
+        # Straight to _overlaps_in_band, no need to keep the lines
+        # around in this process after we're done
+        band_overlaps = functools.partial(_overlaps_in_band, ends)
+        return sum(map(band_overlaps, lows, highs))
+
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_band_worker, initargs=(ends,)
+    ) as executor:
+        return sum(executor.map(_band_overlaps, lows, highs))
+
+
+def _count_parallel(lines: Iterable[Line], diagonal: bool = False) -> int:
+    return parallel_overlaps(endpoints(lines, diagonal))
+
+
+# Coordinates get this added before packing so negative ones still fit
+# in an unsigned 32 bits
+_BIAS = 1 << 31
+_LOW_32 = np.uint64((1 << 32) - 1)
+
+
+def pack(xs: npt.NDArray[np.int64], ys: npt.NDArray[np.int64]) -> npt.NDArray[np.int64]:
+    """
+    Packs each point into a single int64 key, x in the high 32 bits and y in
+    the low 32 bits, coordinates must fit in a signed 32 bit int.
+    """
+    for coords in (xs, ys):
+        if len(coords) and (coords.min() < -_BIAS or coords.max() >= _BIAS):
+            raise ValueError("coordinates must fit in a signed 32 bit int")
+
+    high = (xs + _BIAS).astype(np.uint64) << np.uint64(32)
+    low = (ys + _BIAS).astype(np.uint64)
+    return (high | low).view(np.int64)
+
+
+def unpack(
+    keys: npt.NDArray[np.int64],
+) -> tuple[npt.NDArray[np.int64], npt.NDArray[np.int64]]:
+    """
+    The inverse of `pack`, returns the x and y coordinates of each key.
+    """
+    bits = keys.view(np.uint64)
+    xs = (bits >> np.uint64(32)).astype(np.int64) - _BIAS
+    ys = (bits & _LOW_32).astype(np.int64) - _BIAS
+    return xs, ys
+
+
+@dataclass
+class MemoryReport:
+    """
+    How much memory a `TiledCounter` is using, compared to a dense
+    grid (1 byte per point) covering every tile it's touched.
+    """
+
+    tile_size: int
+    tiles: int
+    allocated_bytes: int
+    dense_bytes: int
+
+    def __str__(self) -> str:
+        return (
+            f"{self.tiles} tiles of {self.tile_size}x{self.tile_size} using {self.allocated_bytes:,} bytes, "
+            f"a dense grid would need {self.dense_bytes:,} bytes"
+        )
+
+
+@dataclass
+class TiledCounter:
+    """
+    A sparse counter of how many times each point has been covered.
+
+    The plane is split into square tiles of `tile_size` x `tile_size`
+    (2 ** tile_bits) points, a tile's counts are only allocated, as a flat
+    uint8 array, the first time a point in it gets covered. So big empty
+    stretches between the lines cost nothing.
+
+    Counts stop at 255, which is plenty for finding overlaps.
+
+    Args:
+        tile_bits (int, optional): Log2 of the tile size. Defaults to 5 (32 x 32),
+            lines only cover a thin strip of each tile they cross so small tiles
+            waste much less memory, bigger ones are a bit quicker for dense areas.
+    """
+
+    tile_bits: int = 5
+    tiles: dict[int, npt.NDArray[np.uint8]] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        if not 0 <= self.tile_bits <= 16:
+            raise ValueError(
+                f"tile_bits must be between 0 and 16, got {self.tile_bits}"
+            )
+
+    @property
+    def tile_size(self) -> int:
+        return 1 << self.tile_bits
+
+    def add(self, xs: npt.NDArray[np.int64], ys: npt.NDArray[np.int64]) -> None:
+        """
+        Count a covering of each of the points (xs[i], ys[i]).
+        """
+        if not len(xs):
+            return
+
+        bits = pack(xs, ys).view(np.uint64)
+        shift = np.uint64(self.tile_bits)
+        mask = np.uint64(self.tile_size - 1)
+        x = bits >> np.uint64(32)
+        y = bits & _LOW_32
+
+        # Key of the tile each point is in (packed the same way as the points)
+        # and where the point is within the tile
+        tile_keys = ((x >> shift) << np.uint64(32)) | (y >> shift)
+        offsets = (((x & mask) << shift) | (y & mask)).astype(np.int64)
+
+        # Sort by tile then by cell so each covered cell is one run, and
+        # each tile one block of runs that's only touched once
+        order = np.lexsort((offsets, tile_keys))
+        tile_keys, offsets = tile_keys[order], offsets[order]
+        new_cell = np.ones(len(offsets), dtype=bool)
+        new_cell[1:] = (tile_keys[1:] != tile_keys[:-1]) | (offsets[1:] != offsets[:-1])
+        firsts = np.flatnonzero(new_cell)
+        counts = np.diff(np.append(firsts, len(offsets)))
+        tile_keys, offsets = tile_keys[firsts], offsets[firsts]
+
+        keys, starts = np.unique(tile_keys, return_index=True)
+        stops = np.append(starts[1:], len(tile_keys))
+
+        # Only the covered cells are updated so the cost goes with the number
+        # of points not the size of the tiles
+        cells = self.tile_size * self.tile_size
+        for key, start, stop in zip(keys.tolist(), starts, stops):
+            tile = self.tiles.get(key)
+            if tile is None:
+                tile = self.tiles[key] = np.zeros(cells, dtype=np.uint8)
+
+            covered = offsets[start:stop]
+            tile[covered] = np.minimum(tile[covered] + counts[start:stop], 255)
+
+    def overlaps(self, threshold: int = 2) -> int:
+        """
+        Returns the number of points covered at least `threshold` times.
+        """
+        return sum(
+            int(np.count_nonzero(tile >= threshold)) for tile in self.tiles.values()
+        )
+
+    def memory_report(self) -> MemoryReport:
+        """
+        Reports how much memory the tiles are taking up.
+        """
+        allocated = sum(tile.nbytes for tile in self.tiles.values())
+
+        dense = 0
+        if self.tiles:
+            tx, ty = unpack(np.array(list(self.tiles), dtype=np.uint64).view(np.int64))
+            # The tile coordinates were never biased so undo the bias unpack removes
+            tx, ty = tx + _BIAS, ty + _BIAS
+            width = int(tx.max() - tx.min()) + 1
+            height = int(ty.max() - ty.min()) + 1
+            dense = width * height * self.tile_size * self.tile_size
+
+        return MemoryReport(
+            tile_size=self.tile_size,
+            tiles=len(self.tiles),
+            allocated_bytes=allocated,
+            dense_bytes=dense,
+        )
+
+
+def _count_tiled(
+    lines: Iterable[Line],
+    diagonal: bool = False,
+    batch_size: int = 4096,
+    tile_bits: int = 5,
+) -> int:
+    """
+    Rasterizes the lines a batch at a time into a `TiledCounter`
+    with tiles of 2 ** `tile_bits` points along each side.
+    """
+    ends = endpoints(lines, diagonal)
+    counter = TiledCounter(tile_bits=tile_bits)
+
+    for start in range(0, len(ends), batch_size):
+        counter.add(*rasterize(ends[start : start + batch_size]))
+
+    return counter.overlaps()
+
+
+# The sweep backend splits the lines up by direction, every line in a family
+# has a key that's the same for every point on it and a position along it:
+#
+# - horizontal: key y, position x
+# - vertical: key x, position y
+# - diagonal (like 0,0 -> 8,8): key y - x, position x
+# - antidiagonal (like 8,0 -> 0,8): key x + y, position x
+FAMILIES = ("horizontal", "vertical", "diagonal", "antidiagonal")
+
+# For each family: key -> sorted, disjoint (low, high) position intervals
+Intervals = dict[int, list[tuple[int, int]]]
+
+
+def _family(line: Line) -> str:
+    """
+    Returns which of the `FAMILIES` `line` belongs to.
+    """
+    dx = line.end.x - line.start.x
+    dy = line.end.y - line.start.y
+
+    if dy == 0:
+        return "horizontal"
+    if dx == 0:
+        return "vertical"
+    if abs(dx) != abs(dy):
+        raise ValueError(f"line is not horizontal, vertical or 45 degrees: {line}")
+    return "diagonal" if dx * dy > 0 else "antidiagonal"
+
+
+def _key_and_position(family: str, x: int, y: int) -> tuple[int, int]:
+    """
+    Returns the key and position of the point (x, y) on a line from `family`.
+    """
+    if family == "horizontal":
+        return y, x
+    if family == "vertical":
+        return x, y
+    if family == "diagonal":
+        return y - x, x
+    return x + y, x
+
+
+def _coverage(segments: Iterable[tuple[int, int, int]]) -> tuple[Intervals, Intervals]:
+    """
+    Sweeps along each key of a family's (key, low, high) `segments`,
+    returning the intervals covered by at least one of them and by at
+    least two of them, without visiting any of the points in between.
+    """
+    events: dict[int, list[tuple[int, int]]] = collections.defaultdict(list)
+    for key, low, high in segments:
+        events[key].append((low, 1))
+        events[key].append((high + 1, -1))
+
+    union: Intervals = {}
+    multi: Intervals = {}
+    for key, changes in events.items():
+        changes.sort()
+        covered = 0
+        union_start = multi_start = 0
+        for position, change in changes:
+            before = covered
+            covered += change
+            if before == 0 and covered > 0:
+                union_start = position
+            elif before > 0 and covered == 0:
+                union.setdefault(key, []).append((union_start, position - 1))
+            if before < 2 <= covered:
+                multi_start = position
+            elif covered < 2 <= before:
+                multi.setdefault(key, []).append((multi_start, position - 1))
+
+    return union, multi
+
+
+def _contains(intervals: Intervals, key: int, position: int) -> bool:
+    """
+    Returns whether `position` is inside one of the intervals for `key`.
+    """
+    spans = intervals.get(key, [])
+    i = bisect.bisect_right(spans, (position, float("inf"))) - 1
+    return i >= 0 and spans[i][0] <= position <= spans[i][1]
+
+
+def _sweep(
+    spans: Iterable[tuple[int, int, int]], queries: Iterable[tuple[int, int, int]]
+) -> Iterator[tuple[int, int]]:
+    """
+    Sweeps over `t`, yielding the (t, key) of every (t_low, t_high, key) span
+    that's active at one of the (t, key_low, key_high) queries and has a key
+    in its range.
+
+    The active spans are kept as a sorted list of keys so each query is
+    a couple of binary searches plus however many matches it has.
+    """
+    ADD, QUERY, REMOVE = 0, 1, 2
+    events: list[tuple[int, int, int, int]] = []
+    for low, high, key in spans:
+        events.append((low, ADD, key, key))
+        events.append((high, REMOVE, key, key))
+    for t, key_low, key_high in queries:
+        events.append((t, QUERY, key_low, key_high))
+    events.sort()
+
+    active: list[int] = []
+    for t, kind, low, high in events:
+        if kind == ADD:
+            bisect.insort(active, low)
+        elif kind == REMOVE:
+            del active[bisect.bisect_left(active, low)]
+        else:
+            start = bisect.bisect_left(active, low)
+            stop = bisect.bisect_right(active, high)
+            for key in active[start:stop]:
+                yield t, key
+
+
+def _crossings(union: dict[str, Intervals]) -> set[tuple[int, int]]:
+    """
+    Returns every point where lines from two different families cross.
+
+    Each pair of families is a sweep with one family as the active spans and
+    the other as the queries, in whichever coordinates makes the spans keys
+    and the queries points (or ranges of keys) on the sweep axis.
+    """
+
+    def segments(family: str) -> Iterator[tuple[int, int, int]]:
+        for key, spans in union[family].items():
+            for low, high in spans:
+                yield key, low, high
+
+    crossings: set[tuple[int, int]] = set()
+
+    # Horizontal vs vertical, sweep along x
+    for x, y in _sweep(
+        ((low, high, y) for y, low, high in segments("horizontal")),
+        ((x, low, high) for x, low, high in segments("vertical")),
+    ):
+        crossings.add((x, y))
+
+    # Horizontal vs diagonals, sweep along y with the diagonal keys
+    for y, k in _sweep(
+        ((low + k, high + k, k) for k, low, high in segments("diagonal")),
+        ((y, y - high, y - low) for y, low, high in segments("horizontal")),
+    ):
+        crossings.add((y - k, y))
+    for y, m in _sweep(
+        ((m - high, m - low, m) for m, low, high in segments("antidiagonal")),
+        ((y, y + low, y + high) for y, low, high in segments("horizontal")),
+    ):
+        crossings.add((m - y, y))
+
+    # Vertical vs diagonals, sweep along x with the diagonal keys
+    for x, k in _sweep(
+        ((low, high, k) for k, low, high in segments("diagonal")),
+        ((x, low - x, high - x) for x, low, high in segments("vertical")),
+    ):
+        crossings.add((x, x + k))
+    for x, m in _sweep(
+        ((low, high, m) for m, low, high in segments("antidiagonal")),
+        ((x, x + low, x + high) for x, low, high in segments("vertical")),
+    ):
+        crossings.add((x, m - x))
+
+    # Diagonal vs antidiagonal, rotate 45 degrees to u = x + y, v = y - x
+    # where they become horizontal and vertical. They only cross on a whole
+    # number point if u and v are both odd or both even
+    for u, v in _sweep(
+        ((2 * low + k, 2 * high + k, k) for k, low, high in segments("diagonal")),
+        ((m, m - 2 * high, m - 2 * low) for m, low, high in segments("antidiagonal")),
+    ):
+        if (u - v) % 2 == 0:
+            crossings.add(((u - v) // 2, (u + v) // 2))
+
+    return crossings
+
+
+def _count_sweep(lines: Iterable[Line], diagonal: bool = False) -> int:
+    """
+    Counts the overlaps from the lines' endpoints alone, never visiting
+    the points in between, so it doesn't care how big the coordinates are.
+
+    A point is covered twice if it's where two lines in the same family
+    overlap, or where two lines from different families cross:
+
+    - The overlaps within each family come from sweeping the start and end
+      of every line along each key (see `_coverage`).
+    - The crossings between families come from sweep lines over the merged
+      lines with an active set of keys (see `_crossings`).
+
+    The two can share points, so every crossing is checked against the
+    overlaps to make sure nothing's counted twice.
+    """
+    segments: dict[str, list[tuple[int, int, int]]] = {
+        family: [] for family in FAMILIES
+    }
+    for line in lines:
+        if not any([diagonal, line.is_horizontal(), line.is_vertical()]):
+            continue
+
+        family = _family(line)
+        key, start = _key_and_position(family, line.start.x, line.start.y)
+        _, end = _key_and_position(family, line.end.x, line.end.y)
+        segments[family].append((key, min(start, end), max(start, end)))
+
+    union: dict[str, Intervals] = {}
+    multi: dict[str, Intervals] = {}
+    for family in FAMILIES:
+        union[family], multi[family] = _coverage(segments[family])
+
+    total = sum(
+        high - low + 1
+        for intervals in multi.values()
+        for low, high in itertools.chain.from_iterable(intervals.values())
+    )
+
+    for x, y in _crossings(union):
+        # How many families' overlaps this crossing is already counted in
+        overlaps = sum(
+            _contains(multi[family], *_key_and_position(family, x, y))
+            for family in FAMILIES
+        )
+        total += 1 if overlaps == 0 else 1 - overlaps
+
+    return total
+
+
+# Map of the name of a counting backend to the function that does it
+BACKENDS: dict[str, Callable[..., int]] = {
+    "counter": _count_counter,
+    "numpy": _count_numpy,
+    "parallel": _count_parallel,
+    "sweep": _count_sweep,
+    "tiled": _count_tiled,
+}
+
+
+def count(
+    lines: Iterable[Line],
+    diagonal: bool = False,
+    backend: str = "counter",
+    **options: int,
+) -> int:
+    """
+    Returns the number of points covered by at least 2 of `lines`,
+    only including the diagonal lines if `diagonal` is True.
+
+    Lines at slopes other than 45 degrees count as diagonals and are drawn
+    like `rasterize` does.
+
+    `backend` picks how it's done, one of `BACKENDS`:
+
+    - "counter": a `collections.Counter` of every `Point`, simple but slow.
+    - "numpy": every line rasterized into arrays and counted on a dense grid.
+    - "parallel": the numpy backend split into horizontal bands over a process pool.
+    - "sweep": sweep lines over the endpoints, for huge coordinates
+      (horizontal, vertical and 45 degree lines only).
+    - "tiled": rasterized into a sparse `TiledCounter`, for big but sparse areas.
+
+    Any `options` are passed on to the backend, e.g. `tile_bits` and `batch_size`
+    for "tiled".
+    """
+    if counter := BACKENDS.get(backend):
+        return counter(lines, diagonal, **options)
+
+    raise ValueError(f"unhandled backend: {backend!r}")
+
+
 if __name__ == "__main__":
     HERE = Path(__file__).parent.resolve()
     INPUT = HERE / "day05.txt"
@@ -1,4 +1,21 @@
-from src.day01.day01 import number_of_grouped_increases, number_of_increases
+import io
+import json
+
+import numpy as np
+import pytest
+
+from src.day01.day01 import (
+    NUMPY_THRESHOLD,
+    IncreaseIndex,
+    SonarMonitor,
+    grouped_increases_sweep,
+    load_binary,
+    number_of_grouped_increases,
+    number_of_increases,
+    parallel_increases,
+    stream_increases,
+    to_binary,
+)
 
 
 def test_part1():
@@ -15,3 +32,192 @@ def test_part2():
     example_answer = 5
 
     assert number_of_grouped_increases(example_readings) == example_answer
+
+
+def test_stream_increases():
+
+    example_readings = [199, 200, 208, 210, 200, 207, 240, 269, 260, 263]
+
+    assert stream_increases(example_readings) == (7, 5)
+
+
+def test_stream_increases_text_lines():
+
+    example_lines = io.StringIO("199\n200\n208\n210\n200\n207\n240\n269\n260\n263\n")
+
+    assert stream_increases(example_lines) == (7, 5)
+
+
+def test_numpy_backend_matches():
+
+    example_readings = np.array([199, 200, 208, 210, 200, 207, 240, 269, 260, 263])
+
+    assert number_of_increases(example_readings) == 7
+    assert number_of_grouped_increases(example_readings) == 5
+
+
+def test_numpy_threshold_matches_python():
+
+    rng = np.random.default_rng(2021)
+    readings = rng.integers(0, 10_000, size=NUMPY_THRESHOLD + 1).tolist()
+
+    assert number_of_increases(readings) == stream_increases(readings, 1)[0]
+    assert number_of_grouped_increases(readings, 5) == stream_increases(readings, 5)[1]
+
+
+def test_binary_round_trip(tmp_path):
+
+    example_lines = io.StringIO("199\n200\n208\n210\n200\n207\n240\n269\n260\n263\n")
+    path = tmp_path / "readings.bin"
+
+    assert to_binary(example_lines, path, chunk_size=3) == 10
+    assert path.stat().st_size == 40
+
+    readings = load_binary(path)
+
+    assert readings.tolist() == [199, 200, 208, 210, 200, 207, 240, 269, 260, 263]
+    assert number_of_increases(readings) == 7
+    assert number_of_grouped_increases(readings) == 5
+
+
+def test_to_binary_out_of_range(tmp_path):
+
+    path = tmp_path / "readings.bin"
+
+    with pytest.raises(ValueError):
+        to_binary(["2147483648"], path)
+
+    with pytest.raises(ValueError):
+        to_binary([1, 2, -2147483649], path)
+
+
+def test_load_binary_empty(tmp_path):
+
+    path = tmp_path / "empty.bin"
+
+    assert to_binary([], path) == 0
+    assert number_of_increases(load_binary(path)) == 0
+
+
+def test_grouped_increases_any_size():
+
+    example_readings = [199, 200, 208, 210, 200, 207, 240, 269, 260, 263]
+
+    assert number_of_grouped_increases(example_readings, 1) == 7
+    assert number_of_grouped_increases(example_readings, 2) == 5
+    assert number_of_grouped_increases(example_readings, 10) == 0
+    assert number_of_grouped_increases(example_readings, 11) == 0
+
+
+def test_grouped_increases_sweep():
+
+    example_readings = [199, 200, 208, 210, 200, 207, 240, 269, 260, 263]
+    want = {1: 7, 2: 5, 3: 5, 10: 0}
+
+    assert grouped_increases_sweep(example_readings, [1, 2, 3, 10]) == want
+    assert grouped_increases_sweep(iter(example_readings), [1, 2, 3, 10]) == want
+    assert grouped_increases_sweep(np.array(example_readings), [1, 2, 3, 10]) == want
+
+
+def test_grouped_increases_sweep_blocks_match():
+
+    rng = np.random.default_rng(2021)
+    readings = rng.integers(0, 10_000, size=5_000)
+    sizes = range(1, 65)
+
+    swept = grouped_increases_sweep(readings, sizes, block_size=100)
+
+    assert swept == {
+        size: number_of_grouped_increases(readings, size) for size in sizes
+    }
+    assert swept == grouped_increases_sweep(readings.tolist(), sizes)
+
+
+def test_sonar_monitor():
+
+    example_readings = [199, 200, 208, 210, 200, 207, 240, 269, 260, 263]
+
+    monitor = SonarMonitor()
+    for reading in example_readings:
+        monitor.append(reading)
+
+    assert monitor.increases == 7
+    assert monitor.grouped_increases == 5
+    assert monitor.readings_seen == 10
+    assert len(monitor.ring) == 3
+
+
+def test_sonar_monitor_snapshot_restore():
+
+    example_readings = [199, 200, 208, 210, 200, 207, 240, 269, 260, 263]
+
+    monitor = SonarMonitor()
+    monitor.extend(example_readings[:4])
+
+    snapshot = json.loads(json.dumps(monitor.snapshot()))
+    restored = SonarMonitor.restore(snapshot)
+    restored.extend(example_readings[4:])
+
+    assert (restored.increases, restored.grouped_increases) == (7, 5)
+
+    # The original shouldn't be affected
+    assert monitor.readings_seen == 4
+
+
+def test_increase_index_ranges():
+
+    rng = np.random.default_rng(2021)
+    readings = rng.integers(0, 100, size=50).tolist()
+
+    index = IncreaseIndex.build(readings, group_size=4)
+
+    assert len(index) == 50
+    for start in range(0, 51, 3):
+        for stop in range(start, 51, 2):
+            assert index.increases(start, stop) == number_of_increases(
+                readings[start:stop]
+            )
+            assert index.grouped_increases(start, stop) == number_of_grouped_increases(
+                readings[start:stop], 4
+            )
+
+
+def test_increase_index_save_load(tmp_path):
+
+    example_readings = [199, 200, 208, 210, 200, 207, 240, 269, 260, 263]
+    path = tmp_path / "index.npz"
+
+    IncreaseIndex.build(example_readings).save(path)
+    index = IncreaseIndex.load(path)
+
+    assert index.group_size == 3
+    assert index.raw.dtype == np.uint32
+    assert index.increases() == 7
+    assert index.grouped_increases() == 5
+    assert index.increases(-3) == 1
+
+
+@pytest.mark.parametrize("group_size", [1, 3, 7])
+def test_parallel_increases(tmp_path, group_size):
+
+    rng = np.random.default_rng(2021)
+    readings = rng.integers(0, 1_000, size=2_000).tolist()
+    path = tmp_path / "readings.txt"
+    path.write_text("\n".join(str(reading) for reading in readings) + "\n")
+
+    got = parallel_increases(
+        path, group_size, workers=2, chunks_per_worker=8, block_size=64
+    )
+
+    assert got == stream_increases(readings, group_size)
+
+
+def test_parallel_increases_example(tmp_path):
+
+    path = tmp_path / "readings.txt"
+    path.write_text("199\n200\n208\n210\n200\n207\n240\n269\n260\n263")
+
+    assert parallel_increases(path, workers=2, chunks_per_worker=5, block_size=4) == (
+        7,
+        5,
+    )
@@ -1,4 +1,20 @@
-from src.day02.day02 import Position
+import io
+
+import pytest
+
+from src.day02.day02 import (
+    DOWN,
+    FORWARD,
+    UP,
+    Course,
+    Position,
+    Segment,
+    TrajectoryIndex,
+    load_binary,
+    parallel_navigate,
+    stream_solve,
+    to_binary,
+)
 
 # Note: I've changed the implementation of Position in place for Part 2
 # so the below will no longer work for part 1
@@ -87,3 +103,215 @@ def test_example_part2_solution():
 
     assert p == answer_position
     assert p.product() == answer_product
+
+
+def test_course_compile():
+    course = Course.compile(["forward 5", "down 5", "up 3"])
+
+    assert course.opcodes.tolist() == [FORWARD, DOWN, UP]
+    assert course.amounts.tolist() == [5, 5, 3]
+    assert len(course) == 3
+
+
+def test_course_compile_errors():
+    with pytest.raises(ValueError, match="unhandled movement"):
+        Course.compile(["sideways 5"])
+
+    with pytest.raises(ValueError, match="malformed movement"):
+        Course.compile(["forward "])
+
+
+def test_course_navigate_example():
+    example_movements = [
+        "forward 5",
+        "down 5",
+        "forward 8",
+        "up 3",
+        "down 8",
+        "forward 2",
+    ]
+
+    course = Course.compile(example_movements)
+
+    assert course.navigate() == Position(horizontal=15, depth=60, aim=10)
+
+
+def test_course_navigate_matches_apply_movements():
+    movements = ["down 4", "up 2", "forward 3", "down 1", "forward 5"]
+    p = Position(horizontal=1, depth=2, aim=3)
+
+    start = Position(horizontal=1, depth=2, aim=3)
+    p.apply_movements(movements)
+
+    assert Course.compile(movements).navigate(start) == p
+    assert Course.compile([]).navigate(start) == start
+
+
+def test_course_navigate_overflow():
+    movements = ["down 2000000000"] * 3 + ["forward 2000000000"] * 3
+    p = Position()
+    p.apply_movements(movements)
+
+    got = Course.compile(movements).navigate()
+
+    assert got == p
+    assert got.depth == 36_000_000_000_000_000_000
+
+
+def test_parallel_navigate_overflow(tmp_path):
+    movements = ["down 2000000000"] * 3 + ["forward 2000000000"] * 3
+    path = tmp_path / "movements.txt"
+    path.write_text("\n".join(movements * 20) + "\n")
+
+    p = Position()
+    p.apply_movements(movements * 20)
+
+    assert parallel_navigate(path, workers=2, chunks_per_worker=3) == p
+
+
+def test_segments_compose():
+    movements = [
+        "down 4",
+        "up 2",
+        "forward 3",
+        "down 1",
+        "forward 5",
+        "up 7",
+        "forward 2",
+    ]
+    start = Position(horizontal=1, depth=2, aim=3)
+
+    p = Position(horizontal=1, depth=2, aim=3)
+    p.apply_movements(movements)
+
+    for split in range(len(movements) + 1):
+        first = Course.compile(movements[:split]).segment()
+        second = Course.compile(movements[split:]).segment()
+        assert (first + second).apply(start) == p
+
+    assert Segment().apply(start) == start
+
+
+def test_parallel_navigate(tmp_path):
+    example_movements = [
+        "forward 5",
+        "down 5",
+        "forward 8",
+        "up 3",
+        "down 8",
+        "forward 2",
+    ]
+    path = tmp_path / "movements.txt"
+    path.write_text("\n".join(example_movements * 50) + "\n")
+
+    p = Position()
+    p.apply_movements(example_movements * 50)
+
+    got = parallel_navigate(path, workers=2, chunks_per_worker=7, block_size=32)
+
+    assert got == p
+
+
+@pytest.mark.parametrize("interval", [1, 3, 4, 100])
+def test_trajectory_index(interval):
+    movements = [
+        "down 4",
+        "up 2",
+        "forward 3",
+        "down 1",
+        "forward 5",
+        "up 7",
+        "forward 2",
+    ]
+    index = TrajectoryIndex.build(Course.compile(movements), interval=interval)
+
+    for moves in range(len(movements) + 1):
+        p = Position()
+        p.apply_movements(movements[:moves])
+        assert index.position_at(moves) == p
+
+    with pytest.raises(ValueError):
+        index.position_at(len(movements) + 1)
+
+
+def test_trajectory_index_overflow():
+    movements = ["down 2000000000"] * 3 + ["forward 2000000000"] * 3
+
+    with pytest.raises(OverflowError):
+        TrajectoryIndex.build(Course.compile(movements))
+
+
+def test_trajectory_index_save_load(tmp_path):
+    movements = [
+        "down 4",
+        "up 2",
+        "forward 3",
+        "down 1",
+        "forward 5",
+        "up 7",
+        "forward 2",
+    ]
+    course = Course.compile(movements)
+    path = tmp_path / "movements.idx.npz"
+
+    TrajectoryIndex.build(course, interval=2).save(path)
+    index = TrajectoryIndex.load(path, course)
+
+    assert index.interval == 2
+    assert index.position_at(5) == Position(horizontal=8, depth=21, aim=3)
+
+    with pytest.raises(ValueError):
+        TrajectoryIndex.load(path, course[:3])
+
+
+def test_stream_solve_example():
+    example_text = io.StringIO(
+        "forward 5\ndown 5\nforward 8\nup 3\ndown 8\nforward 2\n"
+    )
+
+    part1, part2 = stream_solve(example_text)
+
+    assert part1 == Position(horizontal=15, depth=10)
+    assert part1.product() == 150
+    assert part2 == Position(horizontal=15, depth=60, aim=10)
+    assert part2.product() == 900
+
+
+def test_stream_solve_errors():
+    with pytest.raises(ValueError, match="unhandled movement"):
+        stream_solve(["sideways 5"])
+
+    with pytest.raises(ValueError, match="malformed movement"):
+        stream_solve(["forward"])
+
+
+def test_binary_round_trip(tmp_path):
+    example_movements = [
+        "forward 5",
+        "down 5",
+        "forward 8",
+        "up 3",
+        "down 8",
+        "forward 2",
+    ]
+    path = tmp_path / "movements.bin"
+
+    assert to_binary(example_movements[:4], path, chunk_size=3) == 4
+    assert to_binary(example_movements[4:], path, append=True) == 2
+    assert path.stat().st_size == 30
+
+    course = load_binary(path)
+
+    assert course.opcodes.tolist() == [FORWARD, DOWN, FORWARD, UP, DOWN, FORWARD]
+    assert course.amounts.tolist() == [5, 5, 8, 3, 8, 2]
+    assert course.navigate() == Position(horizontal=15, depth=60, aim=10)
+
+
+def test_binary_empty_and_errors(tmp_path):
+    path = tmp_path / "movements.bin"
+
+    assert to_binary([], path) == 0
+    assert load_binary(path).navigate() == Position()
+
+    with pytest.raises(ValueError, match="too big"):
+        to_binary(["forward 9999999999"], path)
@@ -1,5 +1,11 @@
+import numpy as np
+import pytest
+
 from src.day03.day03 import (
     Binary,
+    BitMatrix,
+    BitSlices,
+    BitTrie,
     CountResult,
     get_co2_rating,
     get_epsilon_rate,
@@ -8,6 +14,8 @@ from src.day03.day03 import (
     get_oxygen_rating,
     get_power_consumption,
     most_and_least_common_bits,
+    parallel_column_counts,
+    stream_power_consumption,
 )
 
 # The example binaries are 5 digits long
@@ -198,3 +206,224 @@ def test_get_life_support_rating_example():
     answer = 230
 
     assert get_life_support_rating(example_binaries, TEST_LEN) == answer
+
+
+def test_bit_matrix_parse():
+    matrix = BitMatrix.parse("00100\n11110\n10110\n")
+
+    assert matrix.width == 5
+    assert matrix.bits.tolist() == [[0, 0, 1, 0, 0], [1, 1, 1, 1, 0], [1, 0, 1, 1, 0]]
+    assert matrix.column_counts().tolist() == [2, 1, 3, 2, 0]
+
+
+def test_bit_matrix_parse_errors():
+    with pytest.raises(ValueError):
+        BitMatrix.parse("00100\n1111")
+
+    with pytest.raises(ValueError):
+        BitMatrix.parse("00200")
+
+    with pytest.raises(ValueError):
+        BitMatrix.parse("")
+
+
+def test_bit_matrix_example():
+    example_binaries = [
+        Binary("00100"),
+        Binary("11110"),
+        Binary("10110"),
+        Binary("10111"),
+        Binary("10101"),
+        Binary("01111"),
+        Binary("00111"),
+        Binary("11100"),
+        Binary("10000"),
+        Binary("11001"),
+        Binary("00010"),
+        Binary("01010"),
+    ]
+
+    matrix = BitMatrix.from_binaries(example_binaries)
+
+    assert matrix.gamma_rate() == 22
+    assert matrix.epsilon_rate() == 9
+    assert matrix.power_consumption() == 198
+    assert matrix.oxygen_rating() == 23
+    assert matrix.co2_rating() == 10
+    assert matrix.life_support_rating() == 230
+
+
+def test_bit_matrix_all_same_bit():
+    # Every number has a 1 at the front so there is no least common bit there
+    matrix = BitMatrix(bits=np.array([[1, 0, 1], [1, 1, 0], [1, 1, 1]], dtype=np.uint8))
+
+    assert matrix.oxygen_rating() == 0b111
+    assert matrix.co2_rating() == 0b101
+
+
+def test_bit_trie_example():
+    example_binaries = [
+        Binary("00100"),
+        Binary("11110"),
+        Binary("10110"),
+        Binary("10111"),
+        Binary("10101"),
+        Binary("01111"),
+        Binary("00111"),
+        Binary("11100"),
+        Binary("10000"),
+        Binary("11001"),
+        Binary("00010"),
+        Binary("01010"),
+    ]
+
+    trie = BitTrie.from_binaries(example_binaries)
+
+    assert len(trie) == 12
+    assert trie.oxygen_rating() == 23
+    assert trie.co2_rating() == 10
+    assert trie.life_support_rating() == 230
+
+
+def test_bit_trie_insert():
+    trie = BitTrie(width=3)
+    trie.insert("101")
+
+    assert trie.oxygen_rating() == 0b101
+    assert trie.co2_rating() == 0b101
+
+    trie.insert("110")
+    trie.insert("111")
+
+    # Matches the BitMatrix where every number starts with a 1
+    assert trie.oxygen_rating() == 0b111
+    assert trie.co2_rating() == 0b101
+
+    with pytest.raises(ValueError):
+        trie.insert("1111")
+
+    with pytest.raises(ValueError):
+        trie.insert("121")
+
+
+def test_bit_slices_example():
+    example_text = """00100
+11110
+10110
+10111
+10101
+01111
+00111
+11100
+10000
+11001
+00010
+01010"""
+
+    report = BitSlices.parse(example_text)
+
+    assert report.width == TEST_LEN
+    assert report.count == 12
+    assert report.gamma_rate() == 22
+    assert report.epsilon_rate() == 9
+    assert report.power_consumption() == 198
+    assert report.oxygen_rating() == 23
+    assert report.co2_rating() == 10
+    assert report.life_support_rating() == 230
+
+
+def test_bit_slices_wide():
+    rng = np.random.default_rng(2021)
+    rows = ["".join(rng.choice(["0", "1"], size=256)) for _ in range(200)]
+
+    report = BitSlices.from_lines(rows)
+    matrix = BitMatrix.from_lines(rows)
+
+    assert report.width == 256
+    assert report.gamma_rate() == matrix.gamma_rate()
+    assert report.epsilon_rate() == matrix.epsilon_rate()
+    assert report.oxygen_rating() == matrix.oxygen_rating()
+    assert report.co2_rating() == matrix.co2_rating()
+
+
+def test_bit_slices_parse_errors():
+    with pytest.raises(ValueError):
+        BitSlices.parse("00100\n1111")
+
+    with pytest.raises(ValueError):
+        BitSlices.parse("00200")
+
+    with pytest.raises(ValueError):
+        BitSlices.from_lines(["1", "_", "1"])
+
+    with pytest.raises(ValueError):
+        BitSlices.from_lines(["+1", "01"])
+
+
+def test_parallel_column_counts(tmp_path):
+    example_text = """00100
+11110
+10110
+10111
+10101
+01111
+00111
+11100
+10000
+11001
+00010
+01010"""
+
+    path = tmp_path / "report.txt"
+    path.write_text(example_text)
+
+    counts, lines = parallel_column_counts(
+        path, workers=2, chunks_per_worker=3, block_size=8
+    )
+
+    assert counts == [7, 5, 8, 7, 5]
+    assert lines == 12
+    assert stream_power_consumption(path, workers=2) == 198
+
+    path.write_text(example_text + "\n")
+    assert parallel_column_counts(path, workers=2) == ([7, 5, 8, 7, 5], 12)
+
+    path.write_text(example_text + "\n\n\n")
+    assert parallel_column_counts(path, workers=2) == ([7, 5, 8, 7, 5], 12)
+
+
+@pytest.mark.parametrize("trailer", ["", "\r\n", "\r\n\r\n"])
+def test_parallel_column_counts_crlf(tmp_path, trailer):
+    path = tmp_path / "report.txt"
+    path.write_bytes(b"00100\r\n11110\r\n10110" + trailer.encode())
+
+    counts, lines = parallel_column_counts(
+        path, workers=2, chunks_per_worker=2, block_size=8
+    )
+
+    assert counts == [2, 1, 3, 2, 0]
+    assert lines == 3
+    assert (
+        stream_power_consumption(path, workers=2)
+        == BitSlices.parse("00100\n11110\n10110").power_consumption()
+    )
+
+
+def test_parallel_column_counts_ragged(tmp_path):
+    path = tmp_path / "report.txt"
+    path.write_text("00100\n1111\n10110\n")
+
+    with pytest.raises(ValueError):
+        parallel_column_counts(path, workers=1)
+
+    for bad in ("10a1\n1001\n", "1001\n1021\n", "1001\n 101\n"):
+        path.write_text(bad)
+
+        with pytest.raises(ValueError):
+            parallel_column_counts(path, workers=1)
+
+    # Mixed line endings
+    path.write_bytes(b"00100\r\n11110\n10110\n")
+
+    with pytest.raises(ValueError):
+        parallel_column_counts(path, workers=1)
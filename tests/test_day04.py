@@ -1,4 +1,26 @@
-from src.day04.day04 import Board, Game
+import pytest
+
+from src.day04.day04 import Board, BoardStore, Game, Standings, Tournament
+
+EXAMPLE = """7,4,9,5,11,17,23,2,0,14,21,24,10,16,13,6,15,25,12,22,18,20,8,19,3,26,1
+
+22 13 17 11  0
+ 8  2 23  4 24
+21  9 14 16  7
+ 6 10  3 18  5
+ 1 12 20 15 19
+
+ 3 15  0  2 22
+ 9 18 13 17  5
+19  8  7 25 23
+20 11 10 24  4
+14 21 16 12  6
+
+14 21 17 24  4
+10 16 15  9 19
+18  8 23 26 20
+22 11 13  6  5
+ 2  0 12  3  7"""
 
 
 def test_parse_board():
@@ -71,3 +93,121 @@ def test_example_part2():
     game = Game.parse(example_text)
     score = game.play_last()
     assert score == 1924
+
+
+def test_standings_example():
+    standings = Standings.from_game(Game.parse(EXAMPLE))
+
+    assert standings.turns.tolist() == [13, 14, 11]
+    assert standings.winners() == [2, 0, 1]
+    assert standings.first() == 4512
+    assert standings.last() == 1924
+    assert standings.ranking()[0] == (2, 11, 4512)
+    assert standings.ranking()[-1] == (1, 14, 1924)
+
+
+def test_standings_no_winner():
+    game = Game.parse(EXAMPLE)
+    game.numbers = game.numbers[:5]
+    standings = Standings.from_game(game)
+
+    assert standings.winners() == []
+    with pytest.raises(ValueError):
+        standings.first()
+
+
+def test_standings_repeated_numbers():
+    game = Game.parse(EXAMPLE)
+    game.numbers = game.numbers[:3] + game.numbers + game.numbers
+    standings = Standings.from_game(game)
+
+    # Numbers drawn again later don't change when they were first drawn
+    assert standings.turns.tolist() == [16, 17, 14]
+    assert standings.first() == 4512
+    assert standings.last() == 1924
+
+
+def test_cell_index():
+    game = Game.parse(EXAMPLE)
+
+    assert game.index.cells[7] == [(0, 2, 4), (1, 2, 2), (2, 4, 4)]
+    assert game.index.shapes == [(5, 5), (5, 5), (5, 5)]
+    assert game.index.row_offsets == [0, 5, 10]
+
+
+def test_live_game_example():
+    game = Game.parse(EXAMPLE)
+    live = game.live()
+
+    for number in game.numbers[:11]:
+        assert live.draw(number) == []
+
+    assert live.draw(24) == [(2, 4512)]
+
+    winners = list(game.live().play(game.numbers))
+    assert winners[0] == (2, 24, 4512)
+    assert winners[-1] == (1, 13, 1924)
+    assert [board for board, _, _ in winners] == [2, 0, 1]
+
+
+def test_board_store_replay():
+    game = Game.parse(EXAMPLE)
+    store = BoardStore.from_game(game)
+
+    assert store.first(game.numbers) == 4512
+    assert store.last(game.numbers) == 1924
+
+    # Same again, nothing should have been marked on the boards
+    assert store.first(game.numbers) == 4512
+    assert game.boards[0].grid[0] == [22, 13, 17, 11, 0]
+
+    # A different order where the first board's top row goes first
+    assert list(store.simulate([22, 13, 17, 11, 0])) == [(0, 0, 0)]
+
+    want = [(0, 15, 2730), (1, 14, 1092), (2, 2, 152)]
+    assert list(store.simulate(reversed(game.numbers))) == want
+
+
+def test_board_store_immutable():
+    store = BoardStore.from_game(Game.parse(EXAMPLE))
+
+    with pytest.raises(TypeError):
+        store.cells[22] = ()
+
+    assert hash(store) == hash(BoardStore.from_game(Game.parse(EXAMPLE)))
+
+
+def test_board_store_played_game():
+    game = Game.parse(EXAMPLE)
+    game.play()
+
+    with pytest.raises(ValueError):
+        BoardStore.from_game(game)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_tournament_example(workers):
+    tournament = Tournament.from_game(Game.parse(EXAMPLE))
+
+    result = tournament.play(workers=workers, shard_size=2)
+
+    assert result.turns.tolist() == [13, 14, 11]
+    assert result.first() == 4512
+    assert result.last() == 1924
+    assert result.ranking() == [(2, 11, 4512), (0, 13, 2192), (1, 14, 1924)]
+
+
+def test_tournament_matches_board_store():
+    tournament = Tournament.random(boards=200, rows=3, cols=7, seed=2021)
+
+    numbers = tournament.numbers.tolist()
+    boards = [Board([row.tolist() for row in grid]) for grid in tournament.grids]
+    store = BoardStore.from_game(Game(numbers, boards))
+
+    result = tournament.play(workers=2, shard_size=16)
+    want = [
+        (board, numbers.index(number), score)
+        for board, number, score in store.simulate(numbers)
+    ]
+
+    assert result.ranking() == want
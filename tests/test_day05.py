@@ -1,4 +1,33 @@
-from src.day05.day05 import Line, Point, count
+import collections
+
+import numpy as np
+import pytest
+
+from src.day05.day05 import (
+    BACKENDS,
+    Line,
+    Point,
+    TiledCounter,
+    clip_to_band,
+    count,
+    endpoints,
+    pack,
+    parallel_overlaps,
+    rasterize,
+    split_lines,
+    unpack,
+)
+
+EXAMPLE = """0,9 -> 5,9
+8,0 -> 0,8
+9,4 -> 3,4
+2,2 -> 2,1
+7,0 -> 7,4
+6,4 -> 2,0
+0,9 -> 2,9
+3,4 -> 1,4
+0,0 -> 8,8
+5,5 -> 8,2"""
 
 
 def test_point_parse():
@@ -61,3 +90,223 @@ def test_example_part_2():
     lines = [Line.parse(item) for item in input.splitlines()]
 
     assert count(lines, diagonal=True) == 12
+
+
+def test_rasterize():
+    lines = [
+        Line(start=Point(0, 9), end=Point(3, 9)),
+        Line(start=Point(7, 4), end=Point(7, 2)),
+        Line(start=Point(5, 5), end=Point(8, 2)),
+    ]
+
+    xs, ys = rasterize(endpoints(lines, diagonal=True))
+    got = [Point(int(x), int(y)) for x, y in zip(xs, ys)]
+    want = [point for line in lines for point in line.points_covered()]
+
+    assert sorted(got, key=lambda p: (p.x, p.y)) == sorted(
+        want, key=lambda p: (p.x, p.y)
+    )
+
+
+def test_rasterize_any_slope():
+    xs, ys = rasterize(np.array([[0, 0, 2, 1], [4, 0, 0, 3], [3, 3, 3, 3]]))
+
+    assert list(zip(xs.tolist(), ys.tolist())) == [
+        (0, 0),
+        (1, 1),
+        (2, 1),
+        (4, 0),
+        (3, 1),
+        (2, 2),
+        (1, 2),
+        (0, 3),
+        (3, 3),
+    ]
+
+
+def test_split_lines():
+    ends = np.array([[0, 0, 2, 1], [3, 3, 3, 3]])
+
+    got = [(xs.tolist(), ys.tolist()) for xs, ys in split_lines(ends)]
+
+    assert got == [([0, 1, 2], [0, 1, 1]), ([3], [3])]
+
+
+def test_line_rasterize():
+    line = Line(start=Point(1, 1), end=Point(7, 3))
+    xs, ys = line.rasterize()
+
+    assert list(line.points_covered()) == [
+        Point(int(x), int(y)) for x, y in zip(xs, ys)
+    ]
+    assert line.is_45_degrees() is False
+
+
+@pytest.mark.parametrize("backend", ["counter", "numpy", "parallel", "tiled"])
+def test_any_slope_backends_agree(backend):
+    rng = np.random.default_rng(2021)
+    lines = [
+        Line(start=Point(*map(int, a)), end=Point(*map(int, b)))
+        for a, b in rng.integers(0, 30, size=(200, 2, 2))
+    ]
+    want = sum(
+        n > 1
+        for n in collections.Counter(
+            point for line in lines for point in line.points_covered()
+        ).values()
+    )
+
+    assert count(lines, diagonal=True, backend=backend) == want
+
+
+@pytest.mark.parametrize("backend", sorted(BACKENDS))
+def test_backends_example(backend):
+    lines = [Line.parse(item) for item in EXAMPLE.splitlines()]
+
+    assert count(lines, backend=backend) == 5
+    assert count(lines, diagonal=True, backend=backend) == 12
+    assert count([], backend=backend) == 0
+
+
+@pytest.mark.parametrize("tile_bits", [0, 3, 8])
+def test_tiled_backend_options(tile_bits):
+    lines = [Line.parse(item) for item in EXAMPLE.splitlines()]
+
+    assert count(lines, diagonal=True, backend="tiled", tile_bits=tile_bits) == 12
+    assert count(lines, backend="tiled", tile_bits=tile_bits, batch_size=2) == 5
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        count([], backend="abacus")
+
+
+@pytest.mark.parametrize("diagonal", [False, True])
+def test_sweep_matches_counter(diagonal):
+    rng = np.random.default_rng(2021)
+    lines = []
+    for _ in range(300):
+        x, y = (int(n) for n in rng.integers(0, 40, size=2))
+        length = int(rng.integers(0, 15))
+        dx, dy = [(1, 0), (0, 1), (1, 1), (1, -1), (-1, 0), (-1, 1)][rng.integers(0, 6)]
+        lines.append(
+            Line(start=Point(x, y), end=Point(x + dx * length, y + dy * length))
+        )
+
+    assert count(lines, diagonal, backend="sweep") == count(
+        lines, diagonal, backend="counter"
+    )
+
+
+def test_sweep_huge_coordinates():
+    big = 10**12
+    lines = [
+        Line(start=Point(0, big), end=Point(2 * big, big)),
+        Line(start=Point(big, 0), end=Point(big, 2 * big)),
+        Line(start=Point(big - 5, big), end=Point(big + 5, big)),
+        Line(start=Point(0, 0), end=Point(2 * big, 2 * big)),
+        Line(start=Point(1, 0), end=Point(2 * big + 1, 2 * big)),
+    ]
+
+    # The 11 points where the horizontals overlap (the vertical and the first
+    # diagonal cross them at (big, big), the second diagonal at (big + 1, big))
+    # plus the second diagonal crossing the vertical at (big, big - 1)
+    assert count(lines, backend="sweep") == 11
+    assert count(lines, diagonal=True, backend="sweep") == 12
+
+
+def test_pack_unpack():
+    xs = np.array([0, 1, -1, 2**31 - 1, -(2**31)])
+    ys = np.array([5, -7, 0, -(2**31), 2**31 - 1])
+
+    keys = pack(xs, ys)
+    assert keys.dtype == np.int64
+    assert pack(np.array([1]), np.array([2])).tolist() == [
+        ((1 + 2**31) << 32 | (2 + 2**31)) - 2**64
+    ]
+
+    got_xs, got_ys = unpack(keys)
+    assert got_xs.tolist() == xs.tolist()
+    assert got_ys.tolist() == ys.tolist()
+
+    with pytest.raises(ValueError):
+        pack(np.array([2**31]), np.array([0]))
+
+
+@pytest.mark.parametrize("tile_bits", [0, 2, 8])
+def test_tiled_counter(tile_bits):
+    counter = TiledCounter(tile_bits=tile_bits)
+    counter.add(np.array([0, 1, 2, 1, -5]), np.array([0, 1, 2, 1, -5]))
+    counter.add(np.array([2, 100_000]), np.array([2, 3]))
+
+    assert counter.overlaps() == 2
+    assert counter.overlaps(threshold=1) == 5
+
+
+def test_tiled_counter_saturates():
+    counter = TiledCounter(tile_bits=2)
+    counter.add(np.full(200, 3), np.full(200, 1))
+    counter.add(np.full(200, 3), np.full(200, 1))
+
+    assert counter.overlaps(threshold=255) == 1
+    assert int(sum(tile.sum(dtype=np.int64) for tile in counter.tiles.values())) == 255
+
+
+def test_tiled_counter_memory_report():
+    counter = TiledCounter(tile_bits=4)
+    counter.add(np.array([0, 1_000_000]), np.array([0, 1_000_000]))
+
+    report = counter.memory_report()
+
+    assert report.tile_size == 16
+    assert report.tiles == 2
+    assert report.allocated_bytes == 2 * 16 * 16
+    assert report.dense_bytes > 10**12
+    assert "2 tiles of 16x16" in str(report)
+
+
+def test_clip_to_band():
+    ends = np.array(
+        [
+            [0, 0, 8, 8],  # diagonal through the band
+            [7, 0, 7, 4],  # vertical ending in the band
+            [9, 4, 3, 4],  # horizontal in the band
+            [0, 9, 5, 9],  # horizontal outside the band
+            [5, 5, 8, 2],  # antidiagonal through the band
+        ]
+    )
+
+    clipped, first, last = clip_to_band(ends, 3, 4)
+
+    assert clipped.tolist() == [
+        [0, 0, 8, 8],
+        [7, 0, 7, 4],
+        [9, 4, 3, 4],
+        [5, 5, 8, 2],
+    ]
+    assert first.tolist() == [3, 3, 0, 1]
+    assert last.tolist() == [4, 4, 6, 2]
+
+
+def test_clip_to_band_any_slope():
+    ends = np.array([[0, 0, 9, 2], [0, 0, 1, 9], [9, 9, 0, 6]])
+    xs, ys = rasterize(ends)
+
+    for low, high in [(0, 0), (1, 1), (2, 5), (6, 9)]:
+        clipped, first, last = clip_to_band(ends, low, high)
+        got_xs, got_ys = rasterize(clipped, first, last)
+        inside = (low <= ys) & (ys <= high)
+
+        assert sorted(zip(got_xs.tolist(), got_ys.tolist())) == sorted(
+            zip(xs[inside].tolist(), ys[inside].tolist())
+        )
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_parallel_overlaps(workers):
+    lines = [Line.parse(item) for item in EXAMPLE.splitlines()]
+
+    for diagonal in (False, True):
+        ends = endpoints(lines, diagonal)
+        want = count(lines, diagonal)
+        assert parallel_overlaps(ends, workers=workers, bands_per_worker=3) == want